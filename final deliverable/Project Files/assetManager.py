@@ -0,0 +1,40 @@
+#Loads the menu's text and image files once and keeps them in memory.
+#A file is only read again once its modification time changes, and the
+#modification time itself is only checked every checkInterval seconds.
+import os
+import time
+from tkinter import PhotoImage
+
+class AssetManager(object):
+    def __init__(self, checkInterval=1.0):
+        self.checkInterval = checkInterval
+        self.assets = {} #path -> (mtime, time last checked, asset)
+
+    #the asset at path, loaded with load(path) if it's new or has changed
+    def get(self, path, load):
+        now = time.time()
+        if path in self.assets:
+            (mtime, lastChecked, asset) = self.assets[path]
+            if now - lastChecked < self.checkInterval:
+                return asset
+            if os.path.getmtime(path) == mtime:
+                self.assets[path] = (mtime, now, asset)
+                return asset
+        mtime = os.path.getmtime(path)
+        asset = load(path)
+        self.assets[path] = (mtime, now, asset)
+        return asset
+
+    def getText(self, path):
+        return self.get(path, AssetManager.loadText)
+
+    def getImage(self, path):
+        return self.get(path, AssetManager.loadImage)
+
+    @staticmethod
+    def loadText(path):
+        with open(path, 'r') as f: return f.read()
+
+    @staticmethod
+    def loadImage(path):
+        return PhotoImage(file=path)
@@ -0,0 +1,165 @@
+#Runs many independent games headlessly across a process pool and answers
+#the readme's question: would the 1992 or 2012 Dream Team win?
+#
+#usage: python batchRunner.py [games] [processes] [seed] [store directory] [--ev]
+#(with a store directory, every game's stats are also saved there; see resultStore)
+#(with --ev, ball handlers decide by expected points; see decisionEngine)
+import multiprocessing
+import random
+import sys
+from gameEngine import GameEngine
+from decisionEngine import ExpectedValueDecisions
+from resultStore import ResultStore
+from tabulate import tabulate #https://pypi.python.org/pypi/tabulate
+
+#plays one game with its own seed; runs inside a worker process
+def simulateGame(args):
+    (seed, scale, byValue) = args
+    engine = GameEngine(scale, seed)
+    if byValue: engine.decisions = ExpectedValueDecisions(engine)
+    engine.runToCompletion()
+    playerStats = []
+    for player in engine.players:
+        playerStats.append((player.teamName, player.name, dict(player.stats)))
+    return (seed, engine.getScores(), playerStats)
+
+#running totals over every game that has finished so far
+class BatchResults(object):
+    def __init__(self, teamOneName, teamTwoName, statKeys):
+        self.teamNames = (teamOneName, teamTwoName)
+        self.statKeys = statKeys
+        self.games = 0
+        self.wins = [0, 0]
+        self.scores = ([], []) #final score of every game, per team
+        self.playerTeams = {}
+        self.statTotals = {} #player name -> stat -> total
+
+    #folds one finished game into the totals
+    def addGame(self, result):
+        (seed, scores, playerStats) = result
+        self.games += 1
+        (oneScore, twoScore) = scores
+        if oneScore > twoScore: self.wins[0] += 1
+        elif twoScore > oneScore: self.wins[1] += 1
+        self.scores[0].append(oneScore)
+        self.scores[1].append(twoScore)
+        for (teamName, name, stats) in playerStats:
+            self.playerTeams[name] = teamName
+            totals = self.statTotals.setdefault(name, dict.fromkeys(self.statKeys, 0))
+            for stat in self.statKeys:
+                totals[stat] += stats[stat]
+
+    #chance of each team winning a game
+    def getWinProbabilities(self):
+        if self.games == 0: return (0.0, 0.0)
+        return (self.wins[0] / float(self.games), self.wins[1] / float(self.games))
+
+    #mean, standard deviation, min, and max of a team's final scores
+    def getScoreSummary(self, team):
+        scores = self.scores[team]
+        if len(scores) == 0: return (0.0, 0.0, 0, 0)
+        mean = sum(scores) / float(len(scores))
+        variance = sum((score-mean)**2 for score in scores) / len(scores)
+        return (mean, variance**0.5, min(scores), max(scores))
+
+    #how many games each team scored in each bucket of binSize points
+    def getScoreDistribution(self, binSize=10):
+        distribution = {}
+        for team in range(2):
+            for score in self.scores[team]:
+                low = (score // binSize) * binSize
+                counts = distribution.setdefault(low, [0, 0])
+                counts[team] += 1
+        return sorted(distribution.items())
+
+    #per-game average of every stat, per player
+    def getPlayerAverages(self):
+        averages = []
+        for (name, totals) in self.statTotals.items():
+            averages.append((self.playerTeams[name], name,
+                [totals[stat] / float(self.games) for stat in self.statKeys]))
+        return averages
+
+    #one line for progress reports
+    def getProgressLine(self):
+        (oneChance, twoChance) = self.getWinProbabilities()
+        return "%d games: %s %.1f%% - %s %.1f%%" % (self.games,
+                self.teamNames[0], 100*oneChance, self.teamNames[1], 100*twoChance)
+
+    #full printable summary
+    def getSummary(self):
+        lines = []
+        lines.append("Simulated %d games." % self.games)
+        (oneChance, twoChance) = self.getWinProbabilities()
+        teams = []
+        for team in range(2):
+            (mean, stdev, low, high) = self.getScoreSummary(team)
+            chance = oneChance if team == 0 else twoChance
+            teams.append([self.teamNames[team], "%.1f%%" % (100*chance),
+                            self.wins[team], mean, stdev, low, high])
+        #the averages as floats, so tabulate keeps the ".0" on whole numbers
+        lines.append(tabulate(teams, headers=["Team", "Win %", "Wins", "Avg PTS",
+                                                "Std dev", "Min", "Max"],
+                              floatfmt=".1f", coltypes=[str, str, int, float, float, int, int]))
+        lines.append("")
+        distribution = [["%d-%d" % (low, low+9), one, two]
+                        for (low, (one, two)) in self.getScoreDistribution()]
+        lines.append(tabulate(distribution, headers=["Score"] + list(self.teamNames),
+                              coltypes=[str, int, int]))
+        lines.append("")
+        #column types are known, so tabulate needn't work them out cell by cell
+        averages = [[name] + values
+                    for (teamName, name, values) in self.getPlayerAverages()]
+        lines.append(tabulate(averages, headers=["Name"] + self.statKeys,
+                              floatfmt=".2f", coltypes=[str] + [float]*len(self.statKeys)))
+        return "\n".join(lines)
+
+#independent per-game seeds drawn from the batch's master seed; which worker
+#plays which game doesn't change any game's result
+def getGameSeeds(masterSeed, numGames):
+    seeder = random.Random(masterSeed)
+    return [seeder.getrandbits(64) for i in range(numGames)]
+
+#plays numGames games across a pool of worker processes; onProgress is called
+#with the partial results every time another reportEvery games have finished;
+#if store (a ResultStore) is given, every game is appended to it as well;
+#byValue plays every game with the expected-value decision engine
+def runBatch(numGames, processes=None, seed=0, scale=8, reportEvery=100,
+             onProgress=None, store=None, byValue=False):
+    if processes == None: processes = multiprocessing.cpu_count()
+    template = GameEngine(scale)
+    results = BatchResults(template.teamOneAttributes['teamName'],
+                           template.teamTwoAttributes['teamName'],
+                           template.players[0].sortedStatKeys)
+    seeds = getGameSeeds(seed, numGames)
+    #big enough chunks to keep workers busy, small enough to report often
+    chunksize = max(1, numGames // (processes * 8))
+    pool = multiprocessing.Pool(processes)
+    try:
+        work = [(gameSeed, scale, byValue) for gameSeed in seeds]
+        for result in pool.imap_unordered(simulateGame, work, chunksize):
+            results.addGame(result)
+            if store != None: store.append(result)
+            if onProgress != None and results.games % reportEvery == 0:
+                onProgress(results)
+    finally:
+        pool.close()
+        pool.join()
+        if store != None: store.flush()
+    return results
+
+def printProgress(results):
+    print(results.getProgressLine())
+    sys.stdout.flush()
+
+if __name__ == "__main__":
+    byValue = "--ev" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--ev"]
+    numGames = int(args[0]) if len(args) > 0 else 1000
+    processes = int(args[1]) if len(args) > 1 else None
+    seed = int(args[2]) if len(args) > 2 else 0
+    store = ResultStore(args[3]) if len(args) > 3 else None
+    results = runBatch(numGames, processes, seed, onProgress=printProgress, store=store,
+                       byValue=byValue)
+    print()
+    print(results.getSummary())
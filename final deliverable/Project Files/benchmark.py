@@ -0,0 +1,167 @@
+#Times the game two ways and saves the numbers so runs can be compared:
+#  - the model alone: fixed-seed games played headlessly (ticks, possessions,
+#    and games per second)
+#  - the view's drawing, against a canvas that only records what it's asked
+#    to do (time per draw function), so no display is needed
+#
+#usage: python benchmark.py [games] [frames] [output file]
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+from gameEngine import GameEngine
+from assetManager import AssetManager
+from batchRunner import getGameSeeds
+
+#the view's draw functions that get timed, in the order redrawAll calls them
+drawFunctions = ["createItems", "drawCourt", "drawMenu", "drawPlayers",
+                 "drawBallInHoop", "drawScore", "drawDialogue", "drawClocks",
+                 "drawBall", "drawPauseScreen", "drawProfile"]
+
+#stands in for a Tk canvas: hands out item ids and counts every call
+class RecordingCanvas(object):
+    def __init__(self):
+        self.items = 0
+        self.calls = {}
+
+    def record(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def create(self, name):
+        def createItem(*args, **options):
+            self.record(name)
+            self.items += 1
+            return self.items
+        return createItem
+
+    def __getattr__(self, name):
+        if name.startswith("create_"): return self.create(name)
+        raise AttributeError(name)
+
+    def coords(self, item, *coords):
+        self.record("coords")
+
+    def itemconfig(self, item, **options):
+        self.record("itemconfig")
+
+    def after(self, delay, callback):
+        self.record("after")
+
+#menu images are never shown to anyone, so none are loaded
+class RecordingAssets(AssetManager):
+    def getImage(self, path):
+        return self.get(path, lambda path: None)
+
+#total time and number of calls for each timed function
+class Timings(object):
+    def __init__(self):
+        self.seconds = {}
+        self.calls = {}
+
+    #replaces obj.name with a version of itself that keeps time
+    def wrap(self, obj, name):
+        method = getattr(obj, name)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try: return method(*args, **kwargs)
+            finally: self.add(name, time.perf_counter() - start)
+        setattr(obj, name, timed)
+
+    def add(self, name, seconds):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def getSummary(self):
+        summary = {}
+        for (name, seconds) in self.seconds.items():
+            calls = self.calls[name]
+            summary[name] = {"calls": calls, "seconds": seconds,
+                             "microsecondsPerCall": 1e6 * seconds / calls}
+        return summary
+
+#plays games headlessly, counting ticks and possessions as it goes
+def benchmarkEngine(games, seed=0, scale=8):
+    (ticks, possessions) = (0, 0)
+    start = time.perf_counter()
+    for gameSeed in getGameSeeds(seed, games):
+        engine = GameEngine(scale, gameSeed)
+        offense = engine.teamOne[0].onOffense
+        possessions += 1
+        while not engine.gameOver:
+            engine.introTicksLeft = 0
+            engine.step()
+            ticks += 1
+            if engine.teamOne[0].onOffense != offense:
+                offense = not offense
+                possessions += 1
+    seconds = time.perf_counter() - start
+    return {"games": games, "ticks": ticks, "possessions": possessions,
+            "seconds": seconds, "ticksPerSecond": ticks / seconds,
+            "possessionsPerSecond": possessions / seconds,
+            "gamesPerSecond": games / seconds}
+
+#the view module (its file name has spaces, so it can't just be imported)
+def loadView():
+    here = os.path.dirname(os.path.abspath(__file__))
+    spec = importlib.util.spec_from_file_location("gameView",
+                                                  os.path.join(here, "Game and Player.py"))
+    view = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(view)
+    return view
+
+#steps and redraws the view frames times (the last pausedFrames of them
+#paused, to draw the box score), timing each draw function
+def benchmarkRender(frames, pausedFrames=None, seed=0, scale=8):
+    if pausedFrames == None: pausedFrames = frames // 10
+    game = loadView().Game(scale, seed)
+    game.canvas = RecordingCanvas()
+    game.assets = RecordingAssets()
+    game.initAnimation()
+    timings = Timings()
+    for name in drawFunctions + ["redrawAll", "onTimerFired"]:
+        timings.wrap(game, name)
+    #the menu, then the first frame of the game (which creates every item)
+    game.redrawAll()
+    game.inMenu = False
+    game.redrawAll()
+    start = time.perf_counter()
+    for frame in range(frames):
+        game.paused = frame >= frames - pausedFrames
+        game.onTimerFired()
+        game.redrawAll()
+    seconds = time.perf_counter() - start
+    return {"frames": frames, "pausedFrames": pausedFrames, "seconds": seconds,
+            "framesPerSecond": frames / seconds, "functions": timings.getSummary(),
+            "canvasCalls": game.canvas.calls, "canvasItems": game.canvas.items}
+
+def runBenchmarks(games=5, frames=2000, seed=0, scale=8):
+    return {"time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(), "machine": platform.platform(),
+            "seed": seed, "scale": scale,
+            "engine": benchmarkEngine(games, seed, scale),
+            "render": benchmarkRender(frames, seed=seed, scale=scale)}
+
+def printResults(results):
+    engine = results["engine"]
+    print("Engine: %d games, %.0f ticks/sec, %.1f possessions/sec, %.2f games/sec" %
+          (engine["games"], engine["ticksPerSecond"],
+           engine["possessionsPerSecond"], engine["gamesPerSecond"]))
+    render = results["render"]
+    print("Render: %d frames, %.0f frames/sec" % (render["frames"], render["framesPerSecond"]))
+    functions = render["functions"]
+    for name in drawFunctions + ["redrawAll", "onTimerFired"]:
+        if name in functions:
+            timing = functions[name]
+            print("  %-16s %6d calls %10.1f us/call" %
+                  (name, timing["calls"], timing["microsecondsPerCall"]))
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    path = sys.argv[3] if len(sys.argv) > 3 else "benchmark.json"
+    results = runBenchmarks(games, frames)
+    printResults(results)
+    with open(path, 'w') as f: json.dump(results, f, indent=2, sort_keys=True)
+    print("Results written to %s" % path)
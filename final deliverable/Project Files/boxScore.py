@@ -0,0 +1,116 @@
+#The box score, rendered as the same reStructuredText table that
+#tabulate(..., tablefmt="rst") would give, but only re-rendered when a stat
+#has actually changed, and then only re-formatting the players who changed.
+import array
+
+#every stat kept, in box score order; a stat's number is its column
+class Stat(object):
+    keys = ("PTS", "FGM", "FGA", "3PM", "3PA", "ORB", "DRB",
+            "TRB", "AST", "BLK", "STL", "TOV")
+    (PTS, FGM, FGA, THREEPM, THREEPA, ORB, DRB, TRB, AST, BLK, STL, TOV) = range(12)
+    #a stat's column, by name or by number
+    columns = dict([(key, col) for (col, key) in enumerate(keys)] +
+                   [(col, col) for col in range(len(keys))])
+
+#one Player's stats, in a flat array but read and written like a dict
+#(stats["PTS"] or stats[Stat.PTS]); tells the game whenever one changes
+class StatLine(object):
+    __slots__ = ("counts", "onChange", "version")
+
+    def __init__(self, onChange):
+        self.counts = array.array('l', [0] * len(Stat.keys))
+        self.onChange = onChange
+        self.version = 0 #bumped on every change to this Player's stats
+
+    def __getitem__(self, key):
+        return self.counts[Stat.columns[key]]
+
+    def __setitem__(self, key, value):
+        self.counts[Stat.columns[key]] = value
+        self.version += 1
+        self.onChange()
+
+    def __contains__(self, key):
+        return key in Stat.keys
+
+    def __iter__(self):
+        return iter(Stat.keys)
+
+    def __len__(self):
+        return len(Stat.keys)
+
+    def keys(self):
+        return list(Stat.keys)
+
+    def items(self):
+        return list(zip(Stat.keys, self.counts))
+
+class BoxScore(object):
+    def __init__(self, game):
+        self.game = game
+        self.statKeys = Stat.keys
+        #column widths only ever grow, since stats only ever go up
+        self.widths = [0] * (1 + len(self.statKeys))
+        self.widthsVersion = 0
+        self.cells = {} #player -> (stats version, cells)
+        self.lines = {} #player -> (stats version, widths version, line)
+        self.renderedVersion = None
+        self.text = None
+        for teamName in self.getTeamNames():
+            self.fitCells([teamName])
+
+    def getTeamNames(self):
+        return (self.game.teamOneAttributes['teamName'],
+                self.game.teamTwoAttributes['teamName'])
+
+    #widening columns to fit new cells
+    def fitCells(self, cells):
+        for col in range(len(cells)):
+            if len(cells[col]) > self.widths[col]:
+                self.widths[col] = len(cells[col])
+                self.widthsVersion += 1
+
+    #a Player's name and stats, formatted; redone only if his stats changed
+    def getCells(self, player):
+        version = player.stats.version
+        if player in self.cells and self.cells[player][0] == version:
+            return self.cells[player][1]
+        cells = [player.name]
+        for (stat, count) in zip(self.statKeys, player.stats.counts):
+            cells.append(stat + ":" + str(count))
+        self.cells[player] = (version, cells)
+        self.fitCells(cells)
+        return cells
+
+    #cells padded to their columns' widths, like tabulate's rst rows
+    def formatLine(self, cells):
+        padded = [cells[col].ljust(self.widths[col]) for col in range(len(cells))]
+        return "  ".join(padded).rstrip()
+
+    def getPlayerLine(self, player):
+        version = player.stats.version
+        cached = self.lines.get(player)
+        if cached != None and cached[0] == version and cached[1] == self.widthsVersion:
+            return cached[2]
+        line = self.formatLine(self.getCells(player))
+        self.lines[player] = (version, self.widthsVersion, line)
+        return line
+
+    #the whole table; re-rendered only when the game's stats have changed
+    def getText(self):
+        if self.renderedVersion == self.game.statsVersion:
+            return self.text
+        #cells first, so the widths are settled before any line is padded
+        for player in self.game.players:
+            self.getCells(player)
+        border = "  ".join(["=" * width for width in self.widths])
+        lines = [border]
+        teams = (self.game.teamOne, self.game.teamTwo)
+        for (teamName, team) in zip(self.getTeamNames(), teams):
+            lines.append(teamName)
+            for player in team:
+                lines.append(self.getPlayerLine(player))
+        lines.append(border)
+        self.text = "\n".join(lines)
+        self.renderedVersion = self.game.statsVersion
+        return self.text
@@ -0,0 +1,63 @@
+#The court's geometry, worked out once per game: where the hoops and lines
+#are, which way each team attacks, and which shooting zone a spot is in.
+import math
+
+class CourtGeometry(object):
+    #shooting zones, relative to the hoop being shot at
+    CORNER3 = 0
+    ARC3 = 1
+    PAINT = 2
+    MIDRANGE = 3
+    zoneNames = ("corner three", "arc three", "paint", "midrange")
+    isThree = (True, True, False, False)
+    #shot distance bins, in feet, by lower bound (as in NBA shot charts)
+    shotBinNames = ("0-3 ft", "3-10 ft", "10-16 ft", "16 ft-3pt", "3pt range")
+    shotBinStarts = (0, 3, 10, 16, 23.75)
+
+    def __init__(self, game):
+        self.scale = game.scale
+        self.hoops = (game.hoopOne, game.hoopTwo)
+        (self.left, self.top) = (game.margin, game.margin)
+        (self.right, self.bottom) = (game.margin+game.courtWidth, game.margin+game.courtHeight)
+        self.baselines = (self.left, self.right)
+        #team one attacks hoopOne (to the left), team two hoopTwo (to the right)
+        self.directions = (-1.0, 1.0)
+        self.halfCourt = game.margin + game.courtWidth/2
+        #how far out from each baseline the corner three-point lines go
+        self.cornerThreeX = (self.left + game.corner3Length, self.right - game.corner3Length)
+        self.hoopToCorner3 = game.hoopToCorner3
+        self.hoopToTop3 = game.hoopToTop3
+        self.keyX = (self.left + game.keyWidth, self.right - game.keyWidth)
+        self.keyHalfHeight = game.keyHeight / 2
+        #shot distance bin of every quarter foot (all the bins start on one)
+        longest = int(math.hypot(game.courtWidth, game.courtHeight) / game.scale) + 1
+        self.shotBins = [self.getShotBinSlowly(quarter / 4.0)
+                         for quarter in range(4 * longest)]
+
+    #zone of a shot from (x, y) at hoop (0 = hoopOne, 1 = hoopTwo)
+    def zoneAt(self, x, y, hoop):
+        (hx, hy) = self.hoops[hoop]
+        if hoop == 0: inCorner = x < self.cornerThreeX[0]
+        else: inCorner = x > self.cornerThreeX[1]
+        #corner threes are beyond the straight lines, the rest beyond the arc
+        if inCorner:
+            if abs(y - hy) > self.hoopToCorner3: return self.CORNER3
+        elif math.hypot(x - hx, y - hy) > self.hoopToTop3:
+            return self.ARC3
+        if hoop == 0: inKey = x <= self.keyX[0]
+        else: inKey = x >= self.keyX[1]
+        if inKey and abs(y - hy) <= self.keyHalfHeight: return self.PAINT
+        return self.MIDRANGE
+
+    def getShotBinSlowly(self, feet):
+        shotBin = 0
+        while (shotBin+1 < len(self.shotBinStarts) and
+               feet >= self.shotBinStarts[shotBin+1]):
+            shotBin += 1
+        return shotBin
+
+    #shot distance bin of a shot from distance (in canvas units) away
+    def shotBin(self, distance):
+        quarter = int(4 * (distance / self.scale))
+        if quarter < len(self.shotBins): return self.shotBins[quarter]
+        return len(self.shotBinStarts) - 1
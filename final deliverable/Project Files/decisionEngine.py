@@ -0,0 +1,124 @@
+#On-ball decisions by expected points, as an alternative to each position's
+#fixed tendencies: every option (pass, shoot, drive, hold, move) is scored
+#in one numpy pass over the ball handler and his teammates, and one is
+#picked from a softmax over the scores, so better options are likelier
+#without ever being certain. Used when attached as the engine's decisions.
+#
+#usage: python decisionEngine.py [games]   (plays seeds 0 to games-1 this
+#way, and checks each finishes with as many turnovers as steals)
+import sys
+import numpy
+from courtGeometry import CourtGeometry
+
+class ExpectedValueDecisions(object):
+    options = ("pass", "shoot", "drive", "hold", "move")
+
+    def __init__(self, game, temperature=0.1, passDiscount=0.9, driveDiscount=0.9,
+                 driveFeet=8.0, possessionValue=1.2):
+        self.game = game
+        self.temperature = temperature #in points; lower is greedier
+        self.passDiscount = passDiscount #a pass's worth, relative to the shot it sets up
+        self.driveDiscount = driveDiscount
+        self.driveFeet = driveFeet #how much closer a drive gets before the shot
+        #what keeping the ball is worth with a full shot clock; it's worth
+        #less and less as the clock runs down
+        self.possessionValue = possessionValue
+        self.teams = {} #team -> (the players they're for, index arrays)
+
+    #index arrays for a team's players, their defenders, and the other
+    #team, worked out once per team (and again if the game is reset)
+    def getTeamArrays(self, player):
+        game = self.game
+        cached = self.teams.get(player.team)
+        if cached != None and cached[0] is game.players: return cached[1]
+        team = player.teammates #in position order, ball handler included
+        shooters = numpy.array([teammate.index for teammate in team])
+        defenders = numpy.array([teammate.matchup.index for teammate in team])
+        opponents = numpy.array([opp.index for opp in player.opponents])
+        radii = game.states.radii
+        arrays = {"shooters": shooters, "defenders": defenders, "opponents": opponents,
+                  "defenderRadii": radii[defenders],
+                  #closer than this, a shooter and an opponent are touching
+                  "touching": radii[shooters][:,None] + radii[opponents][None,:],
+                  #chance of a touching opponent blocking each one's shot (see Player.shoot)
+                  "blockChances": 0.1 * numpy.array([teammate.position for teammate in team])}
+        self.teams[player.team] = (game.players, arrays)
+        return arrays
+
+    #expected points of a shot by each of the ball handler's team (him
+    #included), whether each could be passed to, and his shot after a drive
+    def evaluate(self, player):
+        game = self.game
+        states = game.states
+        (distances, hoopDistances) = states.getDistances()
+        arrays = self.getTeamArrays(player)
+        (shooters, defenders) = (arrays["shooters"], arrays["defenders"])
+        handler = player.position - 1
+        shotFeet = hoopDistances[shooters, player.oppHoopIndex] / game.scale
+        defenderFeet = distances[shooters, defenders] / game.scale
+        threes = [CourtGeometry.isThree[teammate.getShotZone()] for teammate in player.teammates]
+        values = game.shotModel.expectedShotValues(shotFeet, defenderFeet, threes)
+        touching = (distances[shooters][:,arrays["opponents"]] < arrays["touching"]).any(axis=1)
+        values[touching] *= 1 - arrays["blockChances"][touching]
+        #a drive ends in a two from closer in, with the same defender on him
+        driveValue = game.shotModel.expectedShotValue(
+            max(shotFeet[handler] - self.driveFeet, 0.0), defenderFeet[handler], False)
+        #passing lanes: the ball has to get past the passer's defender and the
+        #receiver's (the same check as Player.tryPassToTeammate)
+        positions = states.getPositions()
+        (x0, y0) = positions[player.index]
+        (x1, y1) = (positions[shooters,0], positions[shooters,1])
+        (a, b) = (y0 - y1, x1 - x0)
+        c = (x0 - x1)*y0 + (y1 - y0)*x0
+        length = numpy.hypot(a, b)
+        (rx, ry) = (positions[defenders,0], positions[defenders,1])
+        (hx, hy) = positions[player.matchup.index]
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            receiverClear = numpy.abs(a*rx + b*ry + c) / length > arrays["defenderRadii"]
+            passerClear = numpy.abs(a*hx + b*hy + c) / length > arrays["defenderRadii"][handler]
+        openLanes = receiverClear & passerClear
+        openLanes[handler] = False
+        return (values, openLanes, driveValue)
+
+    #the option picked (one of options), and who to pass to if it's a pass
+    def choose(self, player):
+        (values, openLanes, driveValue) = self.evaluate(player)
+        game = self.game
+        scores = numpy.full(len(self.options), -numpy.inf)
+        passValues = numpy.where(openLanes, values * self.passDiscount, -numpy.inf)
+        receiver = int(passValues.argmax())
+        scores[0] = passValues[receiver]
+        scores[1] = values[player.position - 1]
+        if player.openLane(player.matchup):
+            scores[2] = driveValue * self.driveDiscount
+        clockLeft = max(0.0, 1.0 - game.shotClock / game.shotClockTime)
+        scores[3] = scores[4] = self.possessionValue * clockLeft
+        #softmax; options that can't be taken (-inf) get no weight
+        weights = numpy.exp((scores - scores.max()) / self.temperature)
+        cumulative = (weights / weights.sum()).cumsum().tolist()
+        chance = player.random.random()
+        for (option, limit) in zip(self.options, cumulative):
+            if chance < limit: break
+        return (option, player.teammates[receiver])
+
+if __name__ == "__main__":
+    from gameEngine import GameEngine
+    numGames = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    failed = []
+    for seed in range(numGames):
+        engine = GameEngine(8, seed)
+        engine.decisions = ExpectedValueDecisions(engine)
+        try:
+            engine.runToCompletion()
+        except Exception as error:
+            failed.append(seed)
+            print("seed %d: %s: %s" % (seed, type(error).__name__, error))
+            continue
+        #every steal is somebody's turnover
+        steals = sum(player.stats['STL'] for player in engine.players)
+        turnovers = sum(player.stats['TOV'] for player in engine.players)
+        if steals != turnovers:
+            failed.append(seed)
+            print("seed %d: %d steals but %d turnovers" % (seed, steals, turnovers))
+    print("%d of %d games played cleanly" % (numGames - len(failed), numGames))
+    if len(failed) > 0: sys.exit(1)
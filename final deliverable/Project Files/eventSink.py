@@ -0,0 +1,52 @@
+#Where a game's events go as they happen, as structured records instead of
+#play-by-play text (see GameEngine.getEventRecord for what's in one): pass a
+#sink to GameEngine as its eventSink and it's handed every event. (A sink
+#attached after the engine is made misses the events already played,
+#starting with the game's start.)
+#  - NDJSONSink writes them to a file, one JSON object per line
+#  - CallbackSink hands each one to a function
+#
+#usage: python eventSink.py [seed] [output file]   (one headless game's events)
+import json
+import sys
+
+#writes records as newline-delimited JSON, bufferLines at a time
+class NDJSONSink(object):
+    def __init__(self, path, bufferLines=1000):
+        self.file = open(path, "w")
+        self.bufferLines = bufferLines
+        self.lines = []
+        self.records = 0
+
+    def emit(self, record):
+        self.lines.append(json.dumps(record, separators=(",", ":")))
+        self.records += 1
+        if len(self.lines) >= self.bufferLines: self.flush()
+
+    def flush(self):
+        if len(self.lines) == 0: return
+        self.file.write("\n".join(self.lines) + "\n")
+        self.lines = []
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+#calls callback(record) for every record
+class CallbackSink(object):
+    def __init__(self, callback):
+        self.callback = callback
+
+    def emit(self, record):
+        self.callback(record)
+
+if __name__ == "__main__":
+    from gameEngine import GameEngine
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    path = sys.argv[2] if len(sys.argv) > 2 else "events.ndjson"
+    sink = NDJSONSink(path)
+    engine = GameEngine(8, seed, eventSink=sink)
+    engine.runToCompletion()
+    sink.close()
+    print("FINAL SCORE: %d - %d" % engine.getScores())
+    print("%d events written to %s" % (sink.records, path))
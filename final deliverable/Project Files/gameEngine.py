@@ -0,0 +1,1201 @@
+#Headless model of the game: Players, matchups, ball, clocks, and stats.
+#Nothing in here touches Tk, so games can be simulated without a display.
+import math
+import random
+from playerState import PlayerStates
+from spatialGrid import SpatialGrid
+from courtGeometry import CourtGeometry
+from shotModel import ShotModel
+from playByPlay import PlayEvent, PlayByPlay
+from boxScore import Stat, StatLine, BoxScore
+
+class Player(object):
+    #fixed set of attributes (no per-Player __dict__); stats are kept in a
+    #flat StatLine
+    __slots__ = ("game", "index", "oppHoop", "selfHoop", "teamName", "teamColor",
+                 "oppHoopIndex", "selfHoopIndex", "name", "position", "speed",
+                 "hasBall", "onOffense", "onDefense", "inbounding", "inTransition",
+                 "tendencies", "random", "stats", "r", "team", "teammates",
+                 "opponents", "matchup", "xSpots", "ySpots", "location", "spot",
+                 "dx", "dy", "startSpeed", "currentSpeed", "startLocation")
+    #the same stats, in the same order, for everyone
+    sortedStatKeys = list(Stat.keys)
+
+    @staticmethod
+    def getDistance(p1, p2):
+        (x0, y0) = p1
+        (x1, y1) = p2
+        return ((y1-y0)**2 + (x1-x0)**2)**0.5
+
+    @staticmethod #distance from a point to the line segment from p1 to p2
+    def getSegmentDistance(point, p1, p2):
+        (px, py) = point
+        (x0, y0) = p1
+        (x1, y1) = p2
+        (dx, dy) = (x1-x0, y1-y0)
+        lengthSquared = dx**2 + dy**2
+        #closest point on the segment, as a fraction of the way along it
+        if lengthSquared == 0: t = 0
+        else: t = min(max(((px-x0)*dx + (py-y0)*dy) / lengthSquared, 0), 1)
+        return math.hypot(px - (x0 + t*dx), py - (y0 + t*dy))
+
+    @staticmethod
+    def getSlope(p1, p2):
+        (x0, y0) = p1
+        (x1, y1) = p2
+        if x1-x0 == 0: return None
+        return (y1-y0) / (x1-x0)
+
+    @staticmethod #adjusting radius depending on position
+    def getPlayerRadius(position):
+        avgRadius = (18.25/12) #average shoulder width for US man is 18.25"
+        weights = [200,210,220,230,240]
+        weight = weights[position-1]
+        avgWeight = 220.0 #average weight in the NBA according to Wikipedia
+        return (weight/avgWeight) * avgRadius
+
+    @staticmethod #preset tendencies for each position
+    def getTendencies(position):
+        n = position - 1
+        #corresponds to position + 1
+        passBall = [5,3,3,2,2]
+        shoot =    [2,5,3,3,2]
+        drive =    [3,4,3,5,4]
+        hold =     [2,3,3,4,5]
+        move =     [3,3,3,2,3]
+        tendencies = [passBall[n],shoot[n],drive[n],hold[n],move[n]]
+        total = float(sum(tendencies))
+        percentages = [n/total for n in tendencies]
+        summ = 0
+        finalList = []
+        for i in range(len(percentages)):
+            finalList.append(summ + percentages[i])
+            summ += percentages[i]
+        return finalList
+
+    #Player attributes, tendencies, and state
+    def __init__(self, selfAttributes, teamAttributes, game):
+        self.game = game
+        #this Player's index in the game's PlayerStates
+        self.index = game.states.claim(self)
+        #specific to team
+        self.oppHoop = teamAttributes['oppHoop']
+        self.selfHoop = teamAttributes['selfHoop']
+        self.teamName = teamAttributes['teamName']
+        self.teamColor = teamAttributes['teamColor']
+        #which of the game's hoops (0 = hoopOne, 1 = hoopTwo) is which
+        self.oppHoopIndex = 0 if self.oppHoop == game.hoopOne else 1
+        self.selfHoopIndex = 1 - self.oppHoopIndex
+        #personal attributes
+        self.name = selfAttributes['name']
+        self.position = selfAttributes['position']
+        self.speed = selfAttributes['speed']
+        #state of Player in game
+        self.hasBall = selfAttributes['hasBall']
+        self.onOffense = teamAttributes['onOffense']
+        self.onDefense = teamAttributes['onDefense']
+        self.location = selfAttributes['location']
+        self.inbounding = False
+        self.inTransition = False if self.onDefense else True #initial settings
+        #tendencies
+        self.tendencies = Player.getTendencies(self.position)
+        #Player's own random stream, split off of the game's
+        self.random = random.Random(game.random.getrandbits(64))
+        
+        #Player's stats (any change is counted in the game's statsVersion)
+        self.stats = StatLine(game.statsChanged)
+        self.r = Player.getPlayerRadius(self.position) * self.game.scale
+        self.game.states.setRadius(self.index, self.r)
+        #player's direction, current location, and desired location (aka 'spot')
+        (self.dx, self.dy) = (0, 0)
+        self.spot = self.location
+        #for accelerate() purposes
+        self.startSpeed = 5 #default start speed (Vo)
+        self.currentSpeed = self.startSpeed #current speed (Vf)
+        self.startLocation = self.location #start location (Xo)
+
+    #distance to another player
+    def distanceTo(self, other):
+        return self.game.states.distance(self.index, other.index)
+
+    #distance to the hoop this Player shoots at
+    def distanceToOppHoop(self):
+        return self.game.states.hoopDistance(self.index, self.oppHoopIndex)
+
+    #distance to the hoop this Player defends
+    def distanceToSelfHoop(self):
+        return self.game.states.hoopDistance(self.index, self.selfHoopIndex)
+
+    #needed because players move in increments of their speed
+    def canvasAlmostEqual(self, xy0, xy1):
+        epsilon = self.currentSpeed
+        return abs(xy1-xy0) <= epsilon
+
+    #finding Vf with constant acceleration
+    def accelerate(self):
+        #Vf^2 = Vo^2 + 2ax
+        Vo = self.startSpeed
+        if self.game.userPlaying and self is self.game.user:
+            a = self.speed * 1.2
+        else:
+            a = self.speed
+        ((x0, y0), (x1, y1)) = (self.location, self.startLocation)
+        x = math.hypot(x1-x0, y1-y0)
+        self.currentSpeed = (Vo**2 + 2*a*x)**0.5
+
+    #possible steal every time player bumps into a defender
+    def possibleSteal(self, opp):
+        stealChance = .01 / self.position
+        if self.random.random() < stealChance:
+            self.game.addPlay("steal", "\n%s %s stole the ball out of %s's hands!" %
+                (self.game.timestamp, opp.name, self.name), (opp, self))
+            self.hasBall = False
+            opp.hasBall = True
+            self.game.switchOffense()
+            self.game.resetShotClock()
+            self.stats['TOV'] += 1
+            opp.stats['STL'] += 1
+            return True
+        else: return False
+
+    #checks if a player bumps into another player
+    def overlap(self, other):
+        ((x0, y0), (x1, y1)) = (self.location, other.location)
+        distance = math.hypot(x1-x0, y1-y0)
+        r = (self.r + other.r)/2
+        if distance < r:
+            return True
+        else:
+            return False
+
+    #check if in court boundaries
+    def inBounds(self):
+        r = self.r
+        (x, y) = self.location
+        game = self.game
+        #if x-r < game.margin or x+r > game.margin+game.courtWidth:
+        if (self.canvasAlmostEqual(x-r, game.margin) or
+            self.canvasAlmostEqual(x+r, game.margin+game.courtWidth)):
+            return False
+        #elif y-r < game.margin or y+r > game.margin+game.courtHeight:
+        elif (self.canvasAlmostEqual(y-r, game.margin) or
+            self.canvasAlmostEqual(y+r, game.margin+game.courtHeight)):
+            return False
+
+        return True
+
+    #looks at current direction and changes location
+    def move(self):
+        self.accelerate()
+        (x, y) = self.location
+
+        #incorporating the speed of a player in his movement
+        (dx, dy) = (self.dx*self.currentSpeed, self.dy*self.currentSpeed)
+
+        self.location = (x + dx, y + dy)
+        #back-tracking if out of bounds
+        if not self.inBounds():
+            self.spot = (x - dx, y - dy)
+        self.bumpIntoOpponents((x, y), (dx, dy))
+        grid = self.game.states.grid
+        if grid != None: grid.update(self.index, self.location)
+
+    #after moving from (x, y) by (dx, dy): checking if bumping into opponents
+    def bumpIntoOpponents(self, previous, step):
+        (x, y) = previous
+        (dx, dy) = step
+        #opponents are checked in order; a bump moves this Player, so the ones
+        #not checked yet are looked up again around where he ends up
+        game = self.game
+        opps = self.opponents if game.states.grid == None else game.opponentsNear(self)
+        i = 0
+        while i < len(opps):
+            opp = opps[i]
+            i += 1
+            if self.overlap(opp):
+                #if ball is stolen, stop the loop
+                if (self.hasBall and opp.onDefense and self.possibleSteal(opp)):
+                        break
+                randomDirection = self.random.choice([-1,1])
+                self.location = (x, y+randomDirection*self.currentSpeed)
+                self.spot = (x - dx, y - dy)
+                opps = [other for other in game.opponentsNear(self)
+                        if other.index > opp.index]
+                i = 0
+
+    #checks if a player has arrived at his spot
+    def atSpot(self):
+        (selfx, selfy) = self.location
+        (spotx, spoty) = self.spot
+        if self.canvasAlmostEqual(selfx, spotx) and self.canvasAlmostEqual(selfy,spoty):
+            self.startLocation = self.location
+            return True
+        else:
+            return False
+
+    #moves a player to the spot he is assigned to
+    def moveToSpot(self):
+        (selfx, selfy) = self.location
+        (spotx, spoty) = self.spot
+
+        angle = math.atan2((spoty-selfy) , (spotx-selfx))
+
+        (self.dx, self.dy) = 1.0*math.cos(angle), 1.0*math.sin(angle)
+
+        if not self.atSpot(): self.move()
+
+    #using angles to determine if player can drive towards the hoop
+    def openLane(self, other):
+        #using law of cosines to find angle of defender and hoop
+        a = self.game.states.hoopDistance(other.index, self.oppHoopIndex)
+        b = self.r + other.r
+        c = (a**2 + b**2)**0.5
+        #try/except in case of arccos Domain error
+        try: oppAngle = math.acos((b**2-a**2-c**2) / (-2*a*c))
+        except: oppAngle = 0
+        #again, but with self
+        b = self.distanceTo(other)
+        c = self.distanceToOppHoop()
+        try: selfAngle = math.acos((b**2-a**2-c**2) / (-2*a*c))
+        except: selfAngle = 0
+
+        #if there is an angle to drive, or if Player is already past opponent
+        if selfAngle > oppAngle or c < a:
+            return True
+        else:
+            return False
+
+    #driving (getting closer to hoop)
+    def drive(self):
+        (selfx, selfy) = self.location
+        (hx, hy) = self.oppHoop
+        self.spot = self.oppHoop
+        x = selfx - hx
+        y = selfy - hy
+        angle = math.tan(y/x)
+
+        direction = self.game.court.directions[self.team]
+
+        #always try to shoot a lay-up if you get close enough (2 ft.)
+        layupDistance = 2.0 * self.game.scale
+        if self.distanceToOppHoop() < layupDistance:
+            self.shoot()
+
+    #checks if Player is 'open' for a jumpshot
+    def openForShot(self):
+        #really close to basket also counts as open
+        veryClose = 5.0 * self.game.scale #5 ft.
+        if self.distanceToOppHoop() < veryClose:
+            return True
+        #http://analyticsgame.com/nba/stat-exploration-modeling-field-goal-percentage.html
+        openDistance = 3.0 * self.game.scale #3 ft. based on stats from link above
+        shotDistance = self.distanceToOppHoop()
+        #4s and 5s don't shoot three pointers
+        if self.position < 4: shotRange = self.game.hoopToTop3 + 2*openDistance
+        else: shotRange = 17.5 * self.game.scale
+        #if Player is too far or if an opponent is too close = not Open
+        if shotDistance > shotRange:
+            return False
+        for opponent in self.game.opponentsNear(self, openDistance):
+            if self.distanceTo(opponent) < openDistance:
+                return False
+        return True
+
+    #which of the court's zones a shot from here would be from
+    def getShotZone(self):
+        (x, y) = self.location
+        return self.game.court.zoneAt(x, y, self.oppHoopIndex)
+
+    #checks if shot is a three pointer
+    def isThreePointer(self):
+        return CourtGeometry.isThree[self.getShotZone()]
+
+    #points a shot from here would be worth on average, given where his man is
+    def expectedShotValue(self):
+        shotDistance = self.distanceToOppHoop() / self.game.scale
+        oppDistance = self.distanceTo(self.matchup) / self.game.scale
+        return self.game.shotModel.expectedShotValue(shotDistance, oppDistance,
+                                                     self.isThreePointer())
+
+    #shot blocked; ball goes to random player
+    def blockedShot(self):
+        #choosing random player
+        randomPlayer = self.random.randint(0,len(self.game.players)-1)
+        rebounder = self.game.players[randomPlayer]
+        self.hasBall = False
+        rebounder.rebound()
+        #switch sides if rebounder is on the other team
+        if rebounder in self.opponents:
+            self.game.switchOffense()
+
+    #shoot the ball; FGP dependent on how open you are and how far
+    def shoot(self):
+        shotText = "\n%s %s shot the ball..." % (self.game.timestamp,  self.name)
+        #adjusting stats and state
+        zone = self.getShotZone()
+        isThree = CourtGeometry.isThree[zone]
+        #where the shot was from and how good a look it was, for anyone going
+        #through the play-by-play
+        court = self.game.court
+        shotDetails = {"zone": court.zoneNames[zone],
+                       "distanceBin": court.shotBinNames[court.shotBin(self.distanceToOppHoop())]}
+        if isThree: self.stats["3PA"] += 1
+        self.stats["FGA"] += 1
+        self.hasBall = False
+
+        #Field Goal Percentage as a function of shot distance and defender distance
+        #(see shotModel)
+        shotDistance = self.distanceToOppHoop() / self.game.scale
+        oppDistance = self.distanceTo(self.matchup) / self.game.scale
+        FGP = self.game.shotModel.fgp(shotDistance, oppDistance)
+        shotDetails.update(shotDistance=shotDistance, defenderDistance=oppDistance, FGP=FGP)
+
+        #checking if shot is blocked
+        blockChance = .1 * self.position #bigger players have higher chance of blocking shot
+        for opp in self.game.opponentsNear(self):
+            if self.overlap(opp):
+                if self.random.random() < blockChance:
+                    self.game.addPlay("shot", shotText + "and had it blocked by " + opp.name +"!",
+                                      (self, opp), result="blocked", three=isThree, **shotDetails)
+                    opp.stats['BLK'] += 1
+                    self.blockedShot()
+                    return
+
+        if self.random.random() < FGP:
+            if isThree:
+                self.game.addPlay("shot", shotText + "and made a three!", (self,),
+                                  result="made", three=True, **shotDetails)
+                self.stats["PTS"] += 3
+                self.stats["3PM"] += 1
+            else:
+                self.game.addPlay("shot", shotText + "and made the shot.", (self,),
+                                  result="made", three=False, **shotDetails)
+                self.stats["PTS"] += 2
+            self.stats["FGM"] += 1
+            #'passing' to the hoop; to make the animation
+            self.game.ballLocation = self.location
+            self.game.shotMissed = False
+            self.game.passRecipient = self.game.hoopTargets[self.oppHoopIndex]
+            self.game.shooter = self
+            self.game.ballEnd = self.oppHoop
+            self.game.ballBeingPassed = True
+        else:
+            self.game.addPlay("shot", shotText + "and missed it.", (self,),
+                              result="missed", three=isThree, **shotDetails)
+            #'passing' to the hoop; to make the animation
+            self.game.ballLocation = self.location
+            self.game.shotMissed = True
+            self.game.passRecipient = self.game.hoopTargets[self.oppHoopIndex]
+            self.game.shooter = self
+            (hx, hy) = self.oppHoop
+            self.game.ballEnd = (hx, hy)
+            self.game.ballBeingPassed = True
+
+    #Player either passes, shoots, drives, holds, or moves
+    #dependent on tendencies, which are based on Player's position
+    def onBallOffense(self):
+        #or on what each option is worth, if the game has a decision engine
+        if self.game.decisions != None:
+            self.onBallOffenseByValue()
+            return
+        passTendency = self.tendencies[0] 
+        shootTendency = self.tendencies[1]
+        driveTendency = self.tendencies[2]
+        holdTendency = self.tendencies[3]
+        moveTendency = self.tendencies[4]
+
+        chance = self.random.random()
+
+        if chance < passTendency:
+            self.countDecision("pass")
+            self.bestPassPossible()
+        elif chance < shootTendency:
+            self.countDecision("shoot")
+            if self.openForShot():
+                self.shoot()
+        elif chance < driveTendency:
+            self.countDecision("drive")
+            if self.openLane(self.matchup):
+                self.drive()
+        elif chance < holdTendency:
+            self.countDecision("hold")
+            self.spot = self.location
+        else:
+            self.countDecision("move")
+            self.spot = self.newSpot()
+
+    #the same options, picked by the game's decision engine (see decisionEngine)
+    def onBallOffenseByValue(self):
+        (decision, teammate) = self.game.decisions.choose(self)
+        self.countDecision(decision)
+        if decision == "pass":
+            self.tryPassToTeammate(teammate)
+        elif decision == "shoot":
+            self.shoot()
+        elif decision == "drive":
+            self.drive()
+        elif decision == "hold":
+            self.spot = self.location
+        else:
+            self.spot = self.newSpot()
+
+    #counts which way an on-ball decision went, if the game is being profiled
+    def countDecision(self, decision):
+        if self.game.profiler != None:
+            self.game.profiler.count("onBallOffense: " + decision)
+
+    #checking if a teammate is open; passing if he is
+    def tryPassToTeammate(self, teammate):
+        (x0, y0) = self.location
+        (x1, y1) = teammate.location
+        #http://stackoverflow.com/questions/13242738/how-can-i-find-the-general-form-equation-of-a-line-from-two-points
+        a = (y0 - y1)
+        b = (x1 - x0)
+        c = (x0-x1)*y0 + (y1-y0)*x0
+
+        teammateOpp = teammate.matchup
+        (oppx, oppy) = teammateOpp.location
+        #http://www.intmath.com/plane-analytic-geometry/perpendicular-distance-point-line.php
+        d = abs(a*oppx + b*oppy + c) / (a**2+b**2)**0.5
+        (oppx, oppy) = self.matchup.location
+        d2 = abs(a*oppx + b*oppy + c) / (a**2+b**2)**0.5
+
+        #must be able to pass the ball past own defender and teammate's defender
+        if d > teammateOpp.r and d2 > self.matchup.r:
+            self.hasBall = False
+            self.game.ballLocation = (x0,y0)
+            self.game.passer = self
+            self.game.passRecipient = teammate
+            self.game.ballEnd = (x1,y1)
+            self.game.ballBeingPassed = True
+            return True
+        else:
+            return False
+
+    #going through own team and passing to best option
+    def bestPassPossible(self):
+        #sorting teammates by distance to hoop
+        teammatesByDistance = sorted(self.teammates, 
+            #lambda a, b: cmp(Player.getDistance(a.location,hoopLocation),
+            #                    Player.getDistance(b.location,hoopLocation)))
+            # 2to3 fix
+            key = lambda a:a.distanceToOppHoop() )
+        for teammate in teammatesByDistance:
+            if teammate is self: continue
+            else:
+                if self.tryPassToTeammate(teammate): break
+
+    #for offBallOffense - ball either in players hands or in hoop
+    def getBallLocation(self):
+        for player in self.game.players:
+            if player.hasBall:
+                return player.location
+        if self.onDefense: return self.oppHoop
+        else: return self.selfHoop
+
+    #determining spot to go to depending on position
+    def newSpot(self):
+        if self.position == 1:
+            rowTerritory = range(5)
+            colTerritory = [3, 4]
+        elif self.position == 2:
+            rowTerritory = [0, 1]
+            colTerritory = [0, 1, 2]
+        elif self.position == 3:
+            rowTerritory = [3, 4]
+            colTerritory = [0, 1, 2]
+        elif self.position == 4:
+            rowTerritory = [1, 2, 3]
+            colTerritory = [1, 2]
+        elif self.position == 5:
+            rowTerritory = [1, 2, 3]
+            colTerritory = [0, 1]
+
+        randRow = self.random.choice(rowTerritory)
+        randCol = self.random.choice(colTerritory)
+        if self.team == 1:
+            randRow = abs(randRow - 4)
+            randCol = abs(randCol - 4)
+
+        #picking random coordinates in area
+        (x0, x1) = self.xSpots[randCol]
+        (y0, y1) = self.ySpots[randRow]
+        margin = math.ceil(self.r)
+        randX = self.random.randint(margin+x0, x1-margin)
+        randY = self.random.randint(margin+y0, y1-margin)
+        return (randX, randY)
+
+    #trying to get open
+    def offBallOffense(self):
+        moveProb = float(1)/3 #moving to a new spot only 1/3 of the time
+        if self.atSpot():
+            if self.random.random() < moveProb:
+                self.spot = self.newSpot()
+
+    #Player rebounds the ball
+    def rebound(self):
+        #change user to rebounder
+        if self.team == 0 and self.game.userPlaying:
+            self.game.user = self
+        (time, name) = (self.game.timestamp, self.name)
+        if self.onOffense:
+            self.stats["ORB"] += 1
+            reboundDialogue =  "\n%s %s got the offensive rebound!" % (time, name)
+        else:
+            self.stats["DRB"] += 1
+            reboundDialogue =  "\n%s %s got the rebound." % (time, name)
+        self.game.addPlay("rebound", reboundDialogue, (self,), offensive=self.onOffense)
+        self.stats["TRB"] += 1
+        self.hasBall = True
+
+    #find defensive spot: between hoop and offensive Player
+    def onBallDefense(self):
+        (selfx, selfy) = self.location
+        (oppx, oppy) = self.matchup.location
+        (hx, hy) = self.selfHoop
+
+        oppDistance = self.game.states.hoopDistance(self.matchup.index, self.selfHoopIndex)
+        spotDistance = (oppDistance*self.game.scale) ** 0.45
+        #getting angle between hoop and opponent
+        angle = math.atan((oppy-hy)/(oppx-hx))
+        if self.team == 0: spotDistance *= -1
+        spotx = oppx - spotDistance*math.cos(angle)
+        spoty = oppy - spotDistance*math.sin(angle)
+
+        self.spot = (spotx, spoty)
+
+    #find defensive spot: between ball and offensive Player
+    def offBallDefense(self):
+        #if opponent is inbounding, wait for him at half-court
+        if self.matchup.inbounding:
+            (x,y) = (int(self.game.cx), int(self.game.cy))
+            (xr, yr) = (int(self.game.circleR), self.game.courtHeight)
+            randx = self.random.randint(x-xr,x+xr)
+            randy = self.random.randint(y-yr,y+yr)
+            self.spot = (randx,randy)
+            return
+        (selfx, selfy) = self.location
+        (oppx, oppy) = self.matchup.location
+        (hx, hy) = self.selfHoop
+        (ballx, bally) = self.getBallLocation()
+
+        oppDistance = Player.getDistance((oppx,oppy),(ballx, bally))
+        spotDistance = (oppDistance*self.game.scale) ** 0.485 
+        #angle between opponent and ball
+        angle = math.atan2((bally-oppy),(ballx-oppx))
+        spotx = oppx + spotDistance*math.cos(angle)
+        spoty = oppy + spotDistance*math.sin(angle)
+
+        self.spot = (spotx, spoty)
+
+    #Player inbounding the ball
+    def inboundBall(self):
+        #if user is playing
+        if self is self.game.user and self.game.userPlaying:
+            shotClock = (self.game.shotClockTime - self.game.shotClock)
+            #remind user to go inbound the ball
+            if (19.9 < shotClock < 20.1):
+                self.game.addPlay("inbound", "\nUser needs to inbound the ball!", (self,))
+            (x, y) = self.location
+            (hx, hy) = self.selfHoop
+            #give user ball when he reaches the hoop
+            if (self.canvasAlmostEqual(x, hx) and 
+                self.canvasAlmostEqual(y, hy)):
+                self.inbounding = False
+                self.game.ballInHoop = False
+                self.hasBall = True
+        #going to inbound the ball
+        else:
+            self.spot = self.selfHoop
+            if self.atSpot():
+                self.inbounding = False
+                self.game.ballInHoop = False
+                self.hasBall = True
+                self.inTransition = True
+
+    #trying to pass to a guard (positions 1/2)
+    def passToAGuard(self):
+        guards = self.teammates[0:2]
+        for guard in guards:
+            if self.tryPassToTeammate(guard):
+                self.inTransition = False
+            else:
+                self.spot = self.newSpot()
+
+    #trying to get the ball as a guard
+    def getBallAsGuard(self):
+        if not self.hasBall:
+            self.spot = self.newSpot()
+
+    #which decision path to follow based on current state
+    def makeTransitionDecision(self):
+        #inbound the ball
+        if self.inbounding:
+            self.inboundBall()
+        #transition from defense to offense
+        elif self.inTransition:
+            #pass it to a guard
+            if self.position > 2 and self.hasBall:
+                self.passToAGuard()
+            #get the ball as a guard if a guard doesn't have it
+            elif (self in self.teammates[0:2] and 
+                not (self.teammates[0].hasBall or self.teammates[1].hasBall)):
+                self.getBallAsGuard()
+            #everyone else, get to the other side of the court
+            else:
+                selfx = self.location[0]
+                halfCourt = self.game.court.halfCourt
+                if self.team == 0:
+                    if selfx > halfCourt:
+                        self.spot = self.newSpot()
+                    else:
+                        self.inTransition = False
+                else:
+                    if selfx < halfCourt:
+                        self.spot = self.newSpot()
+                    else:
+                        self.inTransition = False
+    
+    #onOffense         
+    def makeOffensiveDecision(self):
+        if self.hasBall: self.onBallOffense()
+        else: self.offBallOffense()
+
+    #onDefense
+    def makeDefensiveDecision(self):
+        if self.matchup.hasBall: self.onBallDefense()
+        else: self.offBallDefense()
+
+#for purposes of drawing the ball being 'passed' to the Hoop; one per basket,
+#made once per game (whether the shot went in is kept by the game)
+class Hoop(object):
+    __slots__ = ("index", "location", "r")
+
+    def __init__(self, index, location, r):
+        self.index = index #0 = hoopOne, 1 = hoopTwo
+        self.location = location
+        self.r = r
+
+#holds the game's model: teams, matchups, ball, clocks, stats, and play-by-play
+#(a seed makes the whole game, play-by-play and box score, reproducible; an
+#eventSink gets every event from the start on, see eventSink)
+class GameEngine(object):
+    #roster size above which players are found through a SpatialGrid
+    gridThreshold = 40
+
+    def __init__(self, scale, seed=None, eventSink=None):
+        self.seed = seed
+        scale = int(scale)
+        self.margin = 5 * scale
+        self.rightMargin = 30 * scale
+        self.scale = scale
+        #court dimensions from http://www.sportsknowhow.com/basketball/dimensions/nba-basketball-court-dimensions.html
+        self.courtWidth = 94.0 * scale
+        self.courtHeight = 50.0 * scale
+        self.circleR = 6.0 * scale
+        self.hoopDistance = 4.0 * scale
+        self.hoopRadius = 9.0/12.0 * scale
+        self.backboardHeight = 6.0 * scale
+        self.keyWidth = 19.0 * scale
+        self.keyHeight = 16.0 * scale
+        self.hoopToCorner3 = 22.0 * scale
+        self.corner3Length = 13.7 * scale
+        self.hoopToTop3 = 23.75 * scale
+        self.ballR = (4.7/12.0) * scale
+        self.width = self.courtWidth+2*self.margin + self.rightMargin
+        self.height = self.courtHeight+2*self.margin
+        #center location and hoop locations
+        (self.cx,self.cy) = (self.margin+(self.courtWidth/2),self.margin+self.courtHeight/2)
+        self.hoopOne = (self.margin + self.hoopDistance + self.hoopRadius, self.height/2)
+        self.hoopTwo = (self.width - self.rightMargin - self.hoopOne[0], self.hoopOne[1])
+        #lines, zones, and directions of play, worked out once
+        self.court = CourtGeometry(self)
+        #field goal percentage by shot and defender distance
+        self.shotModel = ShotModel()
+        #simulated time per step: each step advances the clocks by dt seconds
+        self.timerDelay = 50 #milliseconds
+        self.dt = self.timerDelay / 1000.0
+        #where structured events go as they happen, if anywhere (see eventSink);
+        #given up front so it sees the start of the game, and kept across resets
+        self.eventSink = eventSink
+        #what ball handlers decide with: None for their positions' tendencies,
+        #or a decision engine (see decisionEngine); also kept across resets
+        self.decisions = None
+        #whether to find who is near whom with a SpatialGrid even when the
+        #roster is small enough to just check everyone; also kept across resets
+        self.useGrid = False
+        self.reset()
+
+    #sets up players, teams, and the initial game state (also called to reset)
+    def reset(self):
+        #game's random stream; each Player also gets a stream split off of it
+        self.random = random.Random(self.seed)
+        #bumped whenever any Player's stats change
+        self.statsVersion = 0
+        #every player, by index, for distances between them; past
+        #gridThreshold players, checking everyone for who's nearby costs more
+        #than keeping them filed in a grid
+        playerCount = 10
+        grid = None
+        if self.useGrid or playerCount > GameEngine.gridThreshold:
+            grid = SpatialGrid(self.margin, self.margin, self.courtWidth, self.courtHeight)
+        self.states = PlayerStates(playerCount, (self.hoopOne, self.hoopTwo), grid)
+        #offense team
+        p1Attributes = {"name":"Chris Paul", "position":1, "speed":0.6, 'hasBall':True,'location':(0,0)}
+        p2Attributes = {"name":"Kobe Bryant", "position":2, "speed":0.5, 'hasBall':False,'location':(0,0)}
+        p3Attributes = {"name":"Kevin Durant", "position":3, "speed":0.4, 'hasBall':False,'location':(0,0)}
+        p4Attributes = {"name":"LeBron James", "position":4, "speed":0.3, 'hasBall':False,'location':(0,0)}
+        p5Attributes = {"name":"Tyson Chandler", "position":5, "speed":0.2, 'hasBall':False,'location':(0,0)}
+
+        #defense team
+        p6Attributes = {"name":"Magic Johnson", "position":1, "speed":0.6, 'hasBall':False,'location':(0,0)}
+        p7Attributes = {"name":"Michael Jordan","position":2, "speed":0.5, 'hasBall':False,'location':(0,0)}
+        p8Attributes = {"name":"Larry Bird", "position":3, "speed":0.4, 'hasBall':False,'location':(0,0)}
+        p9Attributes = {"name":"Charles Barkley", "position":4, "speed":0.3, 'hasBall':False,'location':(0,0)}
+        p10Attributes = {"name":"Karl Malone", "position":5, "speed":0.2, 'hasBall':False,'location':(0,0)}
+        
+        self.teamOneAttributes = {"teamName":"2012 Dream Team","teamColor":"red",
+                                    "selfHoop":self.hoopTwo, "oppHoop":self.hoopOne,
+                                    'onOffense':True, 'onDefense':False}
+
+        self.teamTwoAttributes = {"teamName":"1992 Dream Team","teamColor":"lightBlue",
+                                    "selfHoop":self.hoopOne, "oppHoop":self.hoopTwo,
+                                    'onOffense':False, 'onDefense':True}
+        #team one
+        p1 = Player(p1Attributes, self.teamOneAttributes, self)
+        p2 = Player(p2Attributes, self.teamOneAttributes, self)
+        p3 = Player(p3Attributes, self.teamOneAttributes, self)
+        p4 = Player(p4Attributes, self.teamOneAttributes, self)
+        p5 = Player(p5Attributes, self.teamOneAttributes, self)
+        #team two
+        p6 = Player(p6Attributes, self.teamTwoAttributes, self)
+        p7 = Player(p7Attributes, self.teamTwoAttributes, self)
+        p8 = Player(p8Attributes, self.teamTwoAttributes, self)
+        p9 = Player(p9Attributes, self.teamTwoAttributes, self)
+        p10 = Player(p10Attributes, self.teamTwoAttributes, self)
+
+        #assigning teams and match-ups
+        self.players = [p1,p2,p3,p4,p5,p6,p7,p8,p9,p10]
+        self.teamOne = []
+        self.teamTwo = []
+        self.setTeams()
+        self.setMatchups()
+        self.spawnAroundCircle()
+        self.boxScore = BoxScore(self)
+
+        #initial game state
+        self.ballInHoop = False
+        #where the ball goes when it's shot, and whether the last shot missed
+        self.hoopTargets = (Hoop(0, self.hoopOne, self.hoopRadius),
+                            Hoop(1, self.hoopTwo, self.hoopRadius))
+        self.shotMissed = False
+        self.setSpots()
+        self.period = 0 #0 for regulation, 1+ for overtimes
+        self.gameClock = 0
+        self.playByPlay = PlayByPlay()
+        self.gameOver = False
+        self.ballBeingPassed = False
+        self.rebounder = None
+        #game clock and shot clock derived from the number of steps taken
+        self.stopClock = False
+        self.ticks = 0 #steps taken this period
+        self.gameClock = 0 #initial value (goes from 0 - end)
+        self.shotClockStartTick = 0
+        self.shotClockTime = 24
+        self.shotClock = 0 #initial value (goes from 0 - 24)
+        self.timestamp = "[00:00]"
+        #(once the clocks are set, since a sink records when it happened)
+        self.addPlay("start", """\nGame start!""")
+        #can be changed to make game longer/shorter
+        self.endGameTime = 10 * 60 #10 minutes (in seconds)
+        self.overtimeTime = 2 * 60 #2 minutes (in seconds)
+        #before overtime, everything holds still for a while (in seconds)
+        self.overtimeIntroTime = 1.0
+        self.introTicksLeft = 0 #steps left before play resumes
+        self.gameoverPrinted = False
+        #for assist counting
+        self.passer = None
+        self.passTick = 0
+        #who shot the ball last (it's his if it's stolen on the way)
+        self.shooter = None
+        #user can play as Player 1
+        self.userPlaying = False
+        self.user = self.players[0]
+        #Game speed settings
+        self.tempo = 50 #offensive tempo (0-100)
+        #PhaseProfiler timing each part of step(), if one is attached
+        self.profiler = None
+
+    #sets initial player locations around half-court
+    def spawnAroundCircle(self):
+        (cx, cy) = ((self.width-self.rightMargin)/2, self.height/2)
+        r = self.circleR*3
+        angle = math.pi/2
+        for player in self.teamOne:
+            angle -= (2*math.pi)/10
+            player.location = (cx+r*math.cos(angle), cy-r*math.sin(angle))
+        for player in reversed(self.teamTwo):
+            angle -= (2*math.pi)/10
+            player.location = (cx+r*math.cos(angle), cy-r*math.sin(angle))
+        self.states.movedAll()
+
+    #sets teams based on initial offense/defense alignment
+    def setTeams(self):
+        for player in self.players:
+            if player.teamName == self.teamOneAttributes['teamName']:
+                player.team = 0
+                self.teamOne.append(player)
+            else:
+                player.team = 1
+                self.teamTwo.append(player)
+
+        for player in self.players:
+            if player.teamName == self.teamOneAttributes['teamName']:
+                teammates = self.teamOne
+                opponents = self.teamTwo
+            else:
+                teammates = self.teamTwo
+                opponents = self.teamOne
+            player.teammates = teammates
+            player.opponents = opponents
+
+    #assigns each player a match-up based on position
+    def setMatchups(self):
+        for playerOne in self.teamOne:
+            for playerTwo in self.teamTwo:
+                if playerOne.position == playerTwo.position:
+                    playerOne.matchup = playerTwo
+                    playerTwo.matchup = playerOne
+
+    #flips Offense <->Defense
+    def switchOffense(self):
+        for player in self.players:
+                player.onOffense = not player.onOffense
+                player.onDefense = not player.onDefense
+                player.spot = player.location #freeze player
+                if player.onOffense: player.inTransition = True
+                else: player.inTransition = False
+        #the last pass was the other team's
+        self.passer = None
+
+    #finds a rebounder based on distance
+    def getRebounder(self):
+        closestPlayer = None
+        closestDistance = self.courtWidth
+        hoop = 0 if self.teamOne[0].onOffense else 1
+        for player in self.players:
+            #offensive rebound chance
+            offensiveReboundChance = .05 * player.position #bigger, higher chance
+            if player.onOffense:
+                if self.random.random() < offensiveReboundChance: pass
+                else: continue
+
+            distance = self.states.hoopDistance(player.index, hoop)
+            if distance < closestDistance:
+                closestPlayer = player
+                closestDistance = distance
+
+        return closestPlayer
+
+    #a Player's opponents that might be within r of him, in order (by
+    #default, the ones close enough that they might be bumping into him):
+    #all of them, unless there's a grid to narrow them down
+    def opponentsNear(self, player, r=None):
+        grid = self.states.grid
+        if grid == None: return player.opponents
+        if r == None: r = (player.r + self.states.maxRadius) / 2
+        return [self.players[index] for index in grid.near(player.location, r)
+                if self.players[index].team != player.team]
+
+    #in the event of a made shot
+    def madeShot(self):
+        #reward assist, if there was one
+        assistWindow = 2.5 #2.5 seconds for an assist
+        if ((self.ticks-self.passTick)*self.dt < assistWindow
+            and self.passer != None and not isinstance(self.passer, Hoop)):
+            self.passer.stats['AST'] += 1
+            self.addPlay("assist", "\n(%s got the assist.)" % self.passer.name, (self.passer,))
+        self.resetShotClock()
+        self.ballInHoop = True
+        self.switchOffense()
+        #point guard always inbounding
+        if self.teamOne[0].onOffense: self.teamOne[0].inbounding = True
+        else: self.teamTwo[0].inbounding = True
+        #transcripting current score
+        (oneScore,twoScore) = self.getScores()
+        oneName = self.teamOneAttributes['teamName']
+        twoName = self.teamTwoAttributes['teamName']
+        self.addPlay("score", "\n\n %s[%d] - %s[%d] \n" % (oneName,oneScore,twoName,twoScore))
+
+    #in the event of a made shot
+    def missedShot(self):
+        self.resetShotClock()
+        self.rebounder.rebound()
+        #either defensive or offensive rebound
+        if self.rebounder.onDefense:
+            self.switchOffense()
+
+    #implementing of the ball being moved around court
+    def passBall(self):
+        if not isinstance(self.passRecipient, Hoop):
+            self.passTick = self.ticks
+        ballSpeed = 60
+        (x0, y0) = self.ballLocation
+        (x1, y1) = self.ballEnd
+        r = self.passRecipient.r
+
+        distance = ((y1-y0)**2 + (x1-x0)**2)**0.5
+        if distance <= (r + ballSpeed):
+            self.ballBeingPassed = False
+            if isinstance(self.passRecipient, Hoop):
+                #'passing' to the rebounder, now
+                if self.shotMissed:
+                    self.rebounder = self.getRebounder()
+                    self.ballEnd = self.rebounder.location
+                    self.passRecipient = self.rebounder
+                    self.ballBeingPassed = True
+                else:
+                    self.madeShot()
+            else:
+                if self.rebounder != None:
+                    self.missedShot()
+                    self.rebounder = None
+                    return
+                else:
+                    self.passRecipient.hasBall = True
+        else:
+            defenseTeam = self.teamTwo if self.teamTwo[0].onDefense else self.teamOne
+            #the ball can be picked off anywhere along this step, not just
+            #where it is now (a step is longer than a player is wide)
+            angle = math.atan2((y1-y0),(x1-x0))
+            ballStep = (x0 + math.cos(angle)*ballSpeed, y0 + math.sin(angle)*ballSpeed)
+            if self.states.grid != None:
+                #only defenders close enough to the ball's path could reach it
+                reach = self.ballR + self.states.maxRadius
+                defenseTeam = [self.players[index] for index in
+                               self.states.grid.nearSegment(self.ballLocation, ballStep, reach)
+                               if self.players[index] in defenseTeam]
+            for opp in defenseTeam:
+                r = self.ballR + opp.r
+                stealChance = .05 / opp.position #smaller defenders have higher steal chance
+                if (Player.getSegmentDistance(opp.location, self.ballLocation, ballStep) < r
+                    and self.random.random()<stealChance):
+                    #a shot can be stolen on its way to the hoop (or its
+                    #rebound on the way back), and then it's the shooter's
+                    #turnover, not the last passer's
+                    if isinstance(self.passRecipient, Hoop) or self.rebounder != None:
+                        loser = self.shooter
+                    else:
+                        loser = self.passer
+                    self.addPlay("steal", "\n%s %s stole the ball!"  % (self.timestamp, opp.name),
+                                 (opp, loser))
+                    self.switchOffense()
+                    opp.hasBall = True
+                    loser.stats['TOV'] += 1
+                    opp.stats['STL'] += 1
+                    if not isinstance(self.passRecipient, Hoop):
+                        self.passRecipient.hasBall = False
+                    self.rebounder = None
+                    self.resetShotClock()
+                    self.ballBeingPassed = False
+                    #the ball's his now; no one else can steal it this step
+                    break
+
+        angle = math.atan2((y1-y0),(x1-x0))
+        (dx, dy) = (1.0*math.cos(angle), 1.0*math.sin(angle))
+        (bx, by) = self.ballLocation
+        self.ballLocation = (bx + dx*ballSpeed, by + dy*ballSpeed)
+
+    #splitting half-court into 25 boxes or 'spots'
+    def setSpots(self):
+        xSpotsOne = []
+        xSpotsTwo = []
+
+        gridCols = 10
+        gridWidth = self.courtWidth / gridCols
+        leftx = self.margin
+        for col in range(gridCols):
+            rightx = leftx + gridWidth
+            xBounds = (math.ceil(leftx), math.floor(rightx))
+            if col < gridCols/2: xSpotsOne.append(xBounds)
+            else: xSpotsTwo.append(xBounds)
+            leftx = rightx
+
+        ySpots = []
+
+        gridRows = 5
+        gridHeight = self.courtHeight / gridRows
+        topy = self.margin
+        for row in range(gridRows):
+            boty = topy + gridHeight
+            yBounds = (topy + 1, boty)
+            ySpots.append(yBounds)
+            topy = boty
+
+        self.passSpots(xSpotsOne, xSpotsTwo, ySpots)
+
+    #passing on the spots to each Player 
+    def passSpots(self, xOne, xTwo, y):
+        for player in self.players:
+            player.ySpots = y
+            if player.team == 0:
+                player.xSpots = xOne
+            else:
+                player.xSpots = xTwo
+
+    #returns tuple of score
+    def getScores(self):
+        scores = [0, 0]
+        for player in self.players:
+            scores[player.team] += player.stats['PTS']
+        return (scores[0], scores[1])
+
+    #in the event of shot clock expiring
+    def shotClockExpired(self):
+        inboundingTeam = self.teamOne if self.teamOne[0].onDefense else self.teamTwo
+
+        if self.ballBeingPassed:
+            self.ballBeingPassed = False
+
+        #finding who has the ball and taking it away
+        for player in self.players:
+            player.hasBall = False
+
+        self.switchOffense()
+        self.ballInHoop = True
+        
+        inboundingTeam[0].inbounding = True
+
+    #gets the box score (only re-rendered if a stat has changed)
+    def getBoxscore(self):
+        return self.boxScore.getText()
+
+    #called by every Player's StatLine when one of his stats changes
+    def statsChanged(self):
+        self.statsVersion += 1
+
+    #in event of time expiring
+    def timeExpires(self):
+        oneName = self.teamOneAttributes['teamName']
+        twoName = self.teamTwoAttributes['teamName']
+        (oneScore, twoScore) = self.getScores()
+        if oneScore > twoScore: winner = oneName
+        elif twoScore > oneScore: winner = twoName
+        else:
+            self.addPlay("overtime", "\n\n OVERTIME - additional time.\n")
+            self.period += 1
+            self.spawnAroundCircle()
+            self.gameOver = False
+            self.stopClock = False
+            self.ticks = 0
+            self.gameClock = 0
+            self.shotClockStartTick = 0
+            self.shotClockTime = 24
+            self.shotClock = 0
+            #ticks start over, so a pass from regulation must not count
+            #towards an assist in overtime
+            self.passer = None
+            self.passTick = 0
+            self.endGameTime = self.overtimeTime
+            #a moment's pause before play picks up again
+            self.introTicksLeft = int(round(self.overtimeIntroTime / self.dt))
+            return
+        if not self.gameoverPrinted:
+            self.addPlay("gameOver", "\n GAME OVER.\nThe %s are the winners." % winner,
+                         winner=winner)
+            self.gameoverPrinted = True
+        self.gameOver = True
+
+    #reset shot clock back to 24
+    def resetShotClock(self):
+        self.shotClockStartTick = self.ticks
+
+    #records something that happened for the play-by-play
+    def addPlay(self, kind, text, actors=(), **details):
+        names = [actor.name for actor in actors]
+        event = PlayEvent(self.period, self.gameClock, kind, text,
+                          names, self.getScores(), details)
+        self.playByPlay.add(event)
+        if self.eventSink != None:
+            self.eventSink.emit(self.getEventRecord(event, actors))
+
+    #an event as one flat record: when, what, who (the first actor) and where
+    #he was, in feet from the court's top left corner, plus the event's details
+    def getEventRecord(self, event, actors):
+        record = {"period": event.period, "tick": self.ticks, "clock": event.gameClock,
+                  "type": event.kind, "player": None, "team": None, "location": None,
+                  "actors": event.actors, "score": list(event.score),
+                  "text": event.text.strip()}
+        if len(actors) > 0:
+            (x, y) = actors[0].location
+            record["player"] = actors[0].name
+            record["team"] = actors[0].teamName
+            record["location"] = [(x - self.margin) / self.scale, (y - self.margin) / self.scale]
+        record.update(event.details)
+        return record
+
+    #converting gameClock(seconds) to [mm:ss] for the play-by-play
+    def updateTimestamp(self):
+        gameMin = self.gameClock / 60
+        gameSec = self.gameClock % 60
+        self.timestamp = "[%02d:%02d]" % (gameMin, gameSec)
+
+    #on each step, each Player makes a decision
+    def step(self):
+        if self.gameOver: return
+        #between periods: the clocks are stopped and nobody moves
+        if self.introTicksLeft > 0:
+            self.introTicksLeft -= 1
+            return
+        #if profiling, each phase's time is charged to it as it finishes
+        profiler = self.profiler
+        if profiler != None: profiler.begin()
+        #simulated time: every step is dt seconds, however long it took to run
+        self.ticks += 1
+        self.gameClock = self.ticks * self.dt
+        self.shotClock = (self.ticks - self.shotClockStartTick) * self.dt
+        self.updateTimestamp()
+        if profiler != None: profiler.lap("clocks")
+        #checking shot clock
+        if self.shotClock >= self.shotClockTime:
+            self.addPlay("shotClock", "\n%s BZZT. Shot clock expired!" % self.timestamp)
+            self.resetShotClock()
+            self.shotClockExpired()
+        #game time is up
+        if self.gameClock >= self.endGameTime: self.timeExpires()
+        if profiler != None: profiler.lap("shotClock")
+        #ball being passed
+        if self.ballBeingPassed: self.passBall()
+        if profiler != None: profiler.lap("passBall")
+
+        for player in self.players:
+            phase = "decisions"
+            #user playing override
+            if player is self.user and self.userPlaying:
+                if player.inbounding:
+                    player.makeTransitionDecision()
+            #Players make decisions otherwise
+            elif player.inTransition or player.inbounding:
+                phase = "makeTransitionDecision"
+                player.makeTransitionDecision()
+            elif player.onDefense:
+                phase = "makeDefensiveDecision"
+                player.makeDefensiveDecision()
+            elif player.onOffense:
+                phase = "makeOffensiveDecision"
+                offenseFreq = self.tempo / 100.0
+                if self.random.random() < offenseFreq:
+                    player.makeOffensiveDecision()
+            if profiler != None: profiler.lap(phase)
+            #each Player moves right after deciding, so the next one reacts
+            #to where he is now
+            player.moveToSpot()
+            if profiler != None: profiler.lap("moveToSpot")
+        if profiler != None: profiler.end()
+
+    #plays the game out without a display, as fast as it can be simulated
+    #(with no one watching, the pause before overtime is skipped by default)
+    def runToCompletion(self, skipIntros=True):
+        while not self.gameOver:
+            if skipIntros: self.introTicksLeft = 0
+            self.step()
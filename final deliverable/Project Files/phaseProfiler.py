@@ -0,0 +1,81 @@
+#Opt-in timing of each phase of a game step (clocks, passing, each kind of
+#decision, movement) and counts of which way on-ball decisions go. Only
+#used when a PhaseProfiler is attached as the engine's profiler.
+#
+#usage: python phaseProfiler.py [seed] [output file]
+import json
+import sys
+import time
+
+class PhaseProfiler(object):
+    def __init__(self):
+        self.seconds = {} #phase -> total time spent in it
+        self.laps = {} #phase -> number of times it was timed
+        self.counts = {} #e.g. 'onBallOffense: pass' -> times it happened
+        self.ticks = 0
+        self.last = None
+
+    #starts timing a step
+    def begin(self):
+        self.last = time.perf_counter()
+
+    #charges the time since the last lap to phase
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + (now - self.last)
+        self.laps[phase] = self.laps.get(phase, 0) + 1
+        self.last = now
+
+    #done timing a step
+    def end(self):
+        self.ticks += 1
+
+    #adds time measured elsewhere (e.g. drawing) to phase
+    def add(self, phase, seconds):
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+        self.laps[phase] = self.laps.get(phase, 0) + 1
+
+    def count(self, name):
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    #phases, most time first
+    def getPhases(self):
+        return sorted(self.seconds, key=lambda phase: -self.seconds[phase])
+
+    def toDict(self):
+        total = sum(self.seconds.values())
+        phases = {}
+        for (phase, seconds) in self.seconds.items():
+            phases[phase] = {"seconds": seconds, "laps": self.laps[phase],
+                "share": seconds / total if total > 0 else 0.0,
+                "microsecondsPerTick": 1e6 * seconds / self.ticks if self.ticks > 0 else 0.0}
+        return {"ticks": self.ticks, "seconds": total, "phases": phases,
+                "counts": dict(self.counts)}
+
+    def dump(self, path):
+        with open(path, 'w') as f: json.dump(self.toDict(), f, indent=2, sort_keys=True)
+
+    #a few lines for the on-screen overlay
+    def getText(self):
+        total = sum(self.seconds.values())
+        lines = ["Profile: %d ticks" % self.ticks]
+        for phase in self.getPhases():
+            seconds = self.seconds[phase]
+            perTick = 1e6 * seconds / self.ticks if self.ticks > 0 else 0.0
+            share = 100 * seconds / total if total > 0 else 0.0
+            lines.append("%-24s %8.1f us/tick %5.1f%%" % (phase, perTick, share))
+        for name in sorted(self.counts):
+            lines.append("%-24s %8d" % (name, self.counts[name]))
+        return "\n".join(lines)
+
+#profiles one headless game and saves the results
+if __name__ == "__main__":
+    from gameEngine import GameEngine
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    path = sys.argv[2] if len(sys.argv) > 2 else "profile.json"
+    engine = GameEngine(8, seed)
+    engine.profiler = PhaseProfiler()
+    engine.runToCompletion()
+    print(engine.profiler.getText())
+    engine.profiler.dump(path)
+    print("Profile written to %s" % path)
@@ -0,0 +1,40 @@
+#Play-by-play kept as a list of events instead of one ever-growing string.
+#The screen only ever needs the last few lines, which are kept in a ring
+#buffer; the full transcript is only put together when someone asks for it.
+import collections
+
+#one thing that happened in the game
+class PlayEvent(object):
+    def __init__(self, period, gameClock, kind, text, actors, score, details):
+        self.period = period #0 for regulation, 1+ for overtimes
+        self.gameClock = gameClock #seconds into the period
+        self.kind = kind #e.g. 'shot', 'rebound', 'steal', 'assist', 'score'
+        self.text = text #how it reads in the transcript
+        self.actors = actors #names of the players involved
+        self.score = score #(team one, team two) right after it happened
+        self.details = details #anything else worth knowing, by name
+
+class PlayByPlay(object):
+    def __init__(self, recentLines=40):
+        self.events = []
+        #the last recentLines lines of the transcript, for the screen
+        self.recent = collections.deque([""], maxlen=recentLines)
+        self.recentText = None
+
+    def add(self, event):
+        self.events.append(event)
+        #an event's text may continue the current line and/or start new ones
+        lines = event.text.split("\n")
+        self.recent[-1] += lines[0]
+        self.recent.extend(lines[1:])
+        self.recentText = None
+
+    #the last few lines, as one string
+    def getRecentText(self):
+        if self.recentText == None:
+            self.recentText = "\n".join(self.recent)
+        return self.recentText
+
+    #the whole play-by-play, as one string
+    def getTranscript(self):
+        return "".join([event.text for event in self.events])
@@ -0,0 +1,62 @@
+#Every player on the court, by index, for questions about where they all
+#are: one distance at a time, or everyone at once as numpy arrays. Each
+#Player keeps his own location; only the optional SpatialGrid (for big
+#rosters) files a copy of it.
+import math
+import numpy
+
+class PlayerStates(object):
+    def __init__(self, count, hoops, grid=None):
+        self.count = count
+        self.players = [] #in index order
+        self.hoops = [(float(x), float(y)) for (x, y) in hoops]
+        #SpatialGrid for finding who is nearby, or None to just check everyone
+        self.grid = grid
+        #one entry per player
+        self.radii = numpy.zeros(count)
+        self.maxRadius = 0.0
+
+    #hands out the next free index to a new player
+    def claim(self, player):
+        self.players.append(player)
+        return len(self.players) - 1
+
+    def setRadius(self, index, r):
+        self.radii[index] = r
+        self.maxRadius = float(self.radii.max())
+
+    #re-files everyone in the grid (after they've all been put somewhere new)
+    def movedAll(self):
+        if self.grid != None:
+            for player in self.players:
+                self.grid.update(player.index, player.location)
+
+    #everyone's (x, y), in index order
+    def getLocations(self):
+        return [player.location for player in self.players]
+
+    #everyone's (x, y) as an array, one row per player
+    def getPositions(self):
+        return numpy.array(self.getLocations(), dtype=float)
+
+    #distance between two players
+    def distance(self, i, j):
+        ((x0, y0), (x1, y1)) = (self.players[i].location, self.players[j].location)
+        return math.hypot(x1-x0, y1-y0)
+
+    #distance between a player and a hoop
+    def hoopDistance(self, i, hoop):
+        ((x0, y0), (x1, y1)) = (self.players[i].location, self.hoops[hoop])
+        return math.hypot(x1-x0, y1-y0)
+
+    #every pairwise player distance and each player's distance to every hoop,
+    #as arrays, for sizing up many players at once. Nothing is cached:
+    #someone moves nearly every step, so a cache would be rebuilt about as
+    #often as it's read.
+    def getDistances(self):
+        positions = self.getPositions()
+        delta = positions[:,None,:] - positions[None,:,:]
+        distances = numpy.hypot(delta[:,:,0], delta[:,:,1])
+        delta = positions[:,None,:] - numpy.array(self.hoops)[None,:,:]
+        hoopDistances = numpy.hypot(delta[:,:,0], delta[:,:,1])
+        return (distances, hoopDistances)
@@ -0,0 +1,429 @@
+#Recording a game tick by tick to a compact binary file, and playing it back
+#through the view's own drawing code, with seeking and fast-forward.
+#
+#A replay file is:
+#  - a header (scale, seed, how positions are quantized, keyframe spacing)
+#  - one record per tick: every keyframeInterval ticks a keyframe (the whole
+#    state), and in between delta frames (only what changed since the tick
+#    before: who moved and by how much, stat changes, the ball, the clocks)
+#  - the play-by-play events, each with the tick it happened on
+#  - the keyframe index (tick -> file offset), for seeking
+#  - a footer saying where the events and the index start
+#Positions are stored in 1/quantum canvas units, so a player's move from one
+#tick to the next almost always fits in a signed byte.
+#
+#usage: python replay.py [seed] [output file]    (records a headless game)
+#       python "Game and Player.py" [replay file] (watches it)
+import bisect
+import json
+import struct
+import sys
+from playByPlay import PlayEvent, PlayByPlay
+from boxScore import Stat, BoxScore
+
+MAGIC = b"BBRP"
+FOOTER_MAGIC = b"BBRE"
+VERSION = 1
+headerFormat = struct.Struct("<4sHHBQHBH")
+footerFormat = struct.Struct("<QQI4s")
+keyframeFormat = struct.Struct("<IHIIBBBhh")
+deltaFormat = struct.Struct("<BBBHH")
+clockFormat = struct.Struct("<HII")
+statChangeFormat = struct.Struct("<BBH")
+eventFormat = struct.Struct("<IHdHH")
+indexEntryFormat = struct.Struct("<IQ")
+(KEYFRAME, DELTA) = (1, 0)
+#flags kept with every frame
+PASSING = 1 #ball is in the air
+IN_HOOP = 2
+TEAM_ONE_OFFENSE = 4
+GAME_OVER = 8
+USER_PLAYING = 16
+#flags only delta frames use
+BALL_MOVED = 32
+CLOCK_JUMP = 64 #clocks did something besides tick forward once
+stateFlags = PASSING | IN_HOOP | TEAM_ONE_OFFENSE | GAME_OVER | USER_PLAYING
+NOBODY = 255 #holder when nobody has the ball
+
+#keeps a quantized coordinate inside what a signed short can hold
+def clampShort(value):
+    return min(max(value, -32768), 32767)
+
+#a string with its length in front (lengthFormat is a struct code)
+def packString(text, lengthFormat):
+    data = text.encode("utf-8")
+    return struct.pack("<" + lengthFormat, len(data)) + data
+
+def unpackString(data, offset, lengthFormat):
+    (length,) = struct.unpack_from("<" + lengthFormat, data, offset)
+    offset += struct.calcsize("<" + lengthFormat)
+    return (data[offset:offset+length].decode("utf-8"), offset + length)
+
+#everything the view needs to draw one tick
+class ReplayFrame(object):
+    __slots__ = ("number", "period", "ticks", "shotClockStartTick", "flags",
+                 "holder", "user", "ball", "positions", "stats")
+
+    def __init__(self, players):
+        self.number = 0
+        (self.period, self.ticks, self.shotClockStartTick) = (0, 0, 0)
+        self.flags = 0
+        self.holder = NOBODY
+        self.user = 0
+        self.ball = [0, 0]
+        self.positions = [0] * (2 * players) #x0, y0, x1, y1, ...
+        self.stats = [0] * (len(Stat.keys) * players) #player by player
+
+    #the engine's state right now, quantized
+    @staticmethod
+    def capture(engine, number, quantum):
+        frame = ReplayFrame(len(engine.players))
+        frame.number = number
+        (frame.period, frame.ticks) = (engine.period, engine.ticks)
+        frame.shotClockStartTick = engine.shotClockStartTick
+        flags = 0
+        if engine.ballBeingPassed: flags |= PASSING
+        if engine.ballInHoop: flags |= IN_HOOP
+        if engine.teamOne[0].onOffense: flags |= TEAM_ONE_OFFENSE
+        if engine.gameOver: flags |= GAME_OVER
+        if engine.userPlaying: flags |= USER_PLAYING
+        frame.flags = flags
+        frame.user = engine.user.index
+        for player in engine.players:
+            if player.hasBall:
+                frame.holder = player.index
+                break
+        (bx, by) = getattr(engine, "ballLocation", (0, 0))
+        frame.ball = [clampShort(int(round(bx * quantum))),
+                      clampShort(int(round(by * quantum)))]
+        positions = frame.positions
+        for (index, (x, y)) in enumerate(engine.states.getLocations()):
+            positions[2*index] = clampShort(int(round(x * quantum)))
+            positions[2*index+1] = clampShort(int(round(y * quantum)))
+        stats = []
+        for player in engine.players:
+            stats.extend(player.stats.counts)
+        frame.stats = stats
+        return frame
+
+    def encodeKeyframe(self):
+        parts = [struct.pack("<B", KEYFRAME),
+                 keyframeFormat.pack(self.number, self.period, self.ticks,
+                                     self.shotClockStartTick, self.flags,
+                                     self.holder, self.user, *self.ball),
+                 struct.pack("<%dh" % len(self.positions), *self.positions),
+                 struct.pack("<%dH" % len(self.stats), *self.stats)]
+        return b"".join(parts)
+
+    #only what changed since previous (the frame just before this one)
+    def encodeDelta(self, previous):
+        flags = self.flags
+        if self.ball != previous.ball: flags |= BALL_MOVED
+        clockJumped = (self.period != previous.period or
+                       self.ticks != previous.ticks + 1 or
+                       self.shotClockStartTick != previous.shotClockStartTick)
+        if clockJumped: flags |= CLOCK_JUMP
+        (moved, wide, moves) = (0, 0, [])
+        for index in range(len(self.positions) // 2):
+            dx = self.positions[2*index] - previous.positions[2*index]
+            dy = self.positions[2*index+1] - previous.positions[2*index+1]
+            if dx == 0 and dy == 0: continue
+            moved |= 1 << index
+            #a byte each, unless the move is too big for one
+            if -128 <= dx <= 127 and -128 <= dy <= 127:
+                moves.append(struct.pack("<bb", dx, dy))
+            else:
+                wide |= 1 << index
+                moves.append(struct.pack("<hh", dx, dy))
+        parts = [struct.pack("<B", DELTA),
+                 deltaFormat.pack(flags, self.holder, self.user, moved, wide)]
+        parts.extend(moves)
+        if flags & BALL_MOVED: parts.append(struct.pack("<hh", *self.ball))
+        if flags & CLOCK_JUMP:
+            parts.append(clockFormat.pack(self.period, self.ticks, self.shotClockStartTick))
+        changes = [(i, value) for (i, value) in enumerate(self.stats)
+                   if value != previous.stats[i]]
+        parts.append(struct.pack("<B", len(changes)))
+        statCount = len(Stat.keys)
+        for (i, value) in changes:
+            parts.append(statChangeFormat.pack(i // statCount, i % statCount, value))
+        return b"".join(parts)
+
+    #reads a keyframe's body (after its type byte) into this frame
+    def decodeKeyframe(self, data, offset):
+        (self.number, self.period, self.ticks, self.shotClockStartTick, self.flags,
+         self.holder, self.user, bx, by) = keyframeFormat.unpack_from(data, offset)
+        self.ball = [bx, by]
+        offset += keyframeFormat.size
+        count = len(self.positions)
+        self.positions = list(struct.unpack_from("<%dh" % count, data, offset))
+        offset += 2 * count
+        count = len(self.stats)
+        self.stats = list(struct.unpack_from("<%dH" % count, data, offset))
+        return offset + 2 * count
+
+    #applies a delta frame's body (after its type byte) to this frame
+    def decodeDelta(self, data, offset):
+        (flags, self.holder, self.user, moved, wide) = deltaFormat.unpack_from(data, offset)
+        offset += deltaFormat.size
+        self.number += 1
+        self.flags = flags & stateFlags
+        positions = self.positions
+        for index in range(len(positions) // 2):
+            if not moved & (1 << index): continue
+            if wide & (1 << index):
+                (dx, dy) = struct.unpack_from("<hh", data, offset)
+                offset += 4
+            else:
+                (dx, dy) = struct.unpack_from("<bb", data, offset)
+                offset += 2
+            positions[2*index] += dx
+            positions[2*index+1] += dy
+        if flags & BALL_MOVED:
+            self.ball = list(struct.unpack_from("<hh", data, offset))
+            offset += 4
+        if flags & CLOCK_JUMP:
+            (self.period, self.ticks, self.shotClockStartTick) = \
+                clockFormat.unpack_from(data, offset)
+            offset += clockFormat.size
+        else:
+            self.ticks += 1
+        (changes,) = struct.unpack_from("<B", data, offset)
+        offset += 1
+        statCount = len(Stat.keys)
+        for change in range(changes):
+            (player, stat, value) = statChangeFormat.unpack_from(data, offset)
+            self.stats[player * statCount + stat] = value
+            offset += statChangeFormat.size
+        return offset
+
+#writes a replay as the game is played: call record(engine) once right
+#after the game starts and again after every step, then close()
+class ReplayWriter(object):
+    def __init__(self, path, engine, keyframeInterval=100, quantum=8,
+                 bufferSize=1 << 16):
+        self.file = open(path, "wb")
+        self.keyframeInterval = keyframeInterval
+        self.quantum = quantum
+        self.bufferSize = bufferSize
+        self.buffer = bytearray()
+        self.offset = 0 #file offset of the end of the buffer
+        self.frames = 0
+        self.previous = None
+        self.keyframes = [] #(frame, file offset)
+        self.events = [] #(frame, PlayEvent)
+        self.eventsSeen = 0
+        seed = engine.seed if engine.seed != None else 0
+        self.write(headerFormat.pack(MAGIC, VERSION, engine.scale, engine.seed != None,
+                                     seed, quantum, len(engine.players), keyframeInterval))
+
+    def write(self, data):
+        self.buffer += data
+        self.offset += len(data)
+        if len(self.buffer) >= self.bufferSize: self.flush()
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.buffer = bytearray()
+
+    def record(self, engine):
+        frame = ReplayFrame.capture(engine, self.frames, self.quantum)
+        if self.previous == None or self.frames % self.keyframeInterval == 0:
+            self.keyframes.append((self.frames, self.offset))
+            self.write(frame.encodeKeyframe())
+        else:
+            self.write(frame.encodeDelta(self.previous))
+        events = engine.playByPlay.events
+        for event in events[self.eventsSeen:]:
+            self.events.append((self.frames, event))
+        self.eventsSeen = len(events)
+        self.previous = frame
+        self.frames += 1
+
+    #the events and the index go at the end, once they're all known
+    def close(self):
+        eventsOffset = self.offset
+        self.write(struct.pack("<I", len(self.events)))
+        for (frame, event) in self.events:
+            parts = [eventFormat.pack(frame, event.period, event.gameClock, *event.score),
+                     packString(event.kind, "B"), packString(event.text, "H"),
+                     struct.pack("<B", len(event.actors))]
+            parts.extend([packString(name, "B") for name in event.actors])
+            parts.append(packString(json.dumps(event.details, sort_keys=True), "H"))
+            self.write(b"".join(parts))
+        indexOffset = self.offset
+        self.write(struct.pack("<I", len(self.keyframes)))
+        for (frame, offset) in self.keyframes:
+            self.write(indexEntryFormat.pack(frame, offset))
+        self.write(footerFormat.pack(eventsOffset, indexOffset, self.frames, FOOTER_MAGIC))
+        self.flush()
+        self.file.close()
+
+#reads a replay file; frames are decoded on demand, starting from the
+#nearest keyframe when seeking, or from the last frame read when playing on
+class ReplayReader(object):
+    def __init__(self, path):
+        with open(path, "rb") as f: self.data = data = f.read()
+        (magic, version, self.scale, hasSeed, seed, self.quantum, self.players,
+         self.keyframeInterval) = headerFormat.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("%s is not a replay this version can read" % path)
+        self.seed = seed if hasSeed else None
+        (eventsOffset, indexOffset, self.frames, magic) = \
+            footerFormat.unpack_from(data, len(data) - footerFormat.size)
+        if magic != FOOTER_MAGIC:
+            raise ValueError("%s was not closed properly" % path)
+        self.events = self.readEvents(eventsOffset)
+        self.eventFrames = [frame for (frame, event) in self.events]
+        self.keyframes = self.readIndex(indexOffset)
+        self.keyframeNumbers = [frame for (frame, offset) in self.keyframes]
+        self.frame = ReplayFrame(self.players)
+        self.frame.number = -1 #nothing read yet
+        self.offset = None #where the record after self.frame starts
+
+    def readEvents(self, offset):
+        data = self.data
+        (count,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        events = []
+        for i in range(count):
+            (frame, period, gameClock, oneScore, twoScore) = \
+                eventFormat.unpack_from(data, offset)
+            offset += eventFormat.size
+            (kind, offset) = unpackString(data, offset, "B")
+            (text, offset) = unpackString(data, offset, "H")
+            (actorCount,) = struct.unpack_from("<B", data, offset)
+            offset += 1
+            actors = []
+            for actor in range(actorCount):
+                (name, offset) = unpackString(data, offset, "B")
+                actors.append(name)
+            (details, offset) = unpackString(data, offset, "H")
+            events.append((frame, PlayEvent(period, gameClock, kind, text, actors,
+                                            (oneScore, twoScore), json.loads(details))))
+        return events
+
+    def readIndex(self, offset):
+        (count,) = struct.unpack_from("<I", self.data, offset)
+        offset += 4
+        return [indexEntryFormat.unpack_from(self.data, offset + i * indexEntryFormat.size)
+                for i in range(count)]
+
+    #decodes the record at self.offset into self.frame
+    def readNext(self):
+        data = self.data
+        (kind,) = struct.unpack_from("<B", data, self.offset)
+        if kind == KEYFRAME:
+            self.offset = self.frame.decodeKeyframe(data, self.offset + 1)
+        else:
+            self.offset = self.frame.decodeDelta(data, self.offset + 1)
+
+    #frame number (0 to frames-1); the same ReplayFrame is reused every call
+    def readFrame(self, number):
+        if not 0 <= number < self.frames:
+            raise IndexError("frame %d is not in the replay" % number)
+        current = self.frame.number
+        #playing on from here is quicker than starting at a keyframe
+        if self.offset == None or not current <= number < current + self.keyframeInterval:
+            keyframe = bisect.bisect_right(self.keyframeNumbers, number) - 1
+            (self.frame.number, self.offset) = self.keyframes[keyframe]
+            self.readNext()
+        while self.frame.number < number:
+            self.readNext()
+        return self.frame
+
+    #events that happened after frame start, up to and including frame end
+    def getEvents(self, start, end):
+        first = bisect.bisect_right(self.eventFrames, start)
+        last = bisect.bisect_right(self.eventFrames, end)
+        return [event for (frame, event) in self.events[first:last]]
+
+#plays a replay on an engine: each frame is copied into the engine's
+#players, ball, clocks, stats and play-by-play, so anything that draws the
+#engine draws the replay instead
+class Playback(object):
+    def __init__(self, reader, engine):
+        self.reader = reader
+        self.engine = engine
+        self.frame = -1 #frame the engine is showing
+
+    def getLastFrame(self):
+        return self.reader.frames - 1
+
+    def atEnd(self):
+        return self.frame >= self.getLastFrame()
+
+    #starting over, e.g. after the engine has been reset
+    def restart(self):
+        self.frame = -1
+        self.seek(0)
+
+    def advance(self):
+        if not self.atEnd(): self.seek(self.frame + 1)
+
+    #jumping seconds of game time ahead (or back, if negative)
+    def skip(self, seconds):
+        self.seek(self.frame + int(round(seconds / self.engine.dt)))
+
+    def seek(self, number):
+        number = min(max(number, 0), self.getLastFrame())
+        frame = self.reader.readFrame(number)
+        engine = self.engine
+        quantum = float(self.reader.quantum)
+        positions = frame.positions
+        statCount = len(Stat.keys)
+        teamOneOnOffense = bool(frame.flags & TEAM_ONE_OFFENSE)
+        if self.frame < 0 or number < self.frame:
+            #starting or going back: the play-by-play and box score start over
+            engine.playByPlay = PlayByPlay()
+            engine.boxScore = BoxScore(engine)
+            self.frame = -1
+        for player in engine.players:
+            index = player.index
+            player.location = (positions[2*index] / quantum, positions[2*index+1] / quantum)
+            player.hasBall = index == frame.holder
+            player.onOffense = (player.team == 0) == teamOneOnOffense
+            player.onDefense = not player.onOffense
+            stats = player.stats
+            for stat in range(statCount):
+                value = frame.stats[index * statCount + stat]
+                if stats[stat] != value: stats[stat] = value
+        engine.states.movedAll()
+        engine.ballLocation = (frame.ball[0] / quantum, frame.ball[1] / quantum)
+        engine.ballBeingPassed = bool(frame.flags & PASSING)
+        engine.ballInHoop = bool(frame.flags & IN_HOOP)
+        engine.gameOver = bool(frame.flags & GAME_OVER)
+        engine.userPlaying = bool(frame.flags & USER_PLAYING)
+        engine.user = engine.players[frame.user]
+        (engine.period, engine.ticks) = (frame.period, frame.ticks)
+        engine.shotClockStartTick = frame.shotClockStartTick
+        engine.gameClock = engine.ticks * engine.dt
+        engine.shotClock = (engine.ticks - engine.shotClockStartTick) * engine.dt
+        engine.updateTimestamp()
+        for event in self.reader.getEvents(self.frame, number):
+            engine.playByPlay.add(event)
+        self.frame = number
+
+#plays a game headlessly, recording every tick (overtime intros included)
+def recordGame(path, seed=None, scale=8, keyframeInterval=100):
+    from gameEngine import GameEngine
+    engine = GameEngine(scale, seed)
+    writer = ReplayWriter(path, engine, keyframeInterval)
+    writer.record(engine)
+    while not engine.gameOver:
+        engine.step()
+        writer.record(engine)
+    writer.close()
+    return engine
+
+if __name__ == "__main__":
+    import os
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    path = sys.argv[2] if len(sys.argv) > 2 else "game.replay"
+    engine = recordGame(path, seed)
+    reader = ReplayReader(path)
+    print("FINAL SCORE: %d - %d" % engine.getScores())
+    print("Recorded %d ticks, %d events, %d keyframes in %d bytes (%.1f bytes/tick)" %
+          (reader.frames, len(reader.events), len(reader.keyframes),
+           os.path.getsize(path), os.path.getsize(path) / float(reader.frames)))
+    print("Replay written to %s" % path)
@@ -0,0 +1,147 @@
+#Batch results kept on disk as columns: a directory with one fixed-width,
+#append-only file per column, which numpy can memory-map, so totals over
+#millions of games never go through Python dicts.
+#  - per game: seed, teamOneScore, teamTwoScore (one value per game)
+#  - per player-game: each stat in Stat.keys (one row per game, one value
+#    per player, in roster order)
+#  - store.json: the roster and each column's type
+#Games are in the order they finished, not the order they were started.
+#
+#usage: python resultStore.py [store directory]   (prints shooting totals)
+import json
+import os
+import sys
+import numpy
+from boxScore import Stat
+
+class ResultStore(object):
+    version = 1
+    gameColumns = (("seed", "<u8"), ("teamOneScore", "<i2"), ("teamTwoScore", "<i2"))
+    statType = "<i2"
+
+    def __init__(self, path, bufferGames=1000):
+        self.path = path
+        self.bufferGames = bufferGames #games held in memory between writes
+        self.columnTypes = dict(self.gameColumns)
+        for stat in Stat.keys:
+            self.columnTypes[stat] = self.statType
+        self.buffers = dict([(name, []) for name in self.columnTypes])
+        self.buffered = 0
+        self.teamNames = None
+        self.players = None #[(teamName, name)], in roster order
+        self.games = 0
+        if not os.path.isdir(path): os.makedirs(path)
+        if os.path.exists(self.getMetaPath()):
+            with open(self.getMetaPath()) as f: meta = json.load(f)
+            if meta["version"] != self.version or meta["columns"] != self.columnTypes:
+                raise ValueError("%s has different columns than this version writes" % path)
+            self.teamNames = tuple(meta["teamNames"])
+            self.players = [tuple(player) for player in meta["players"]]
+            self.games = self.repair()
+
+    def getMetaPath(self):
+        return os.path.join(self.path, "store.json")
+
+    def getColumnPath(self, name):
+        return os.path.join(self.path, name + ".col")
+
+    def isPlayerColumn(self, name):
+        return name in Stat.keys
+
+    #values per game in a column
+    def getWidth(self, name):
+        return len(self.players) if self.isPlayerColumn(name) else 1
+
+    #games written completely to a column's file
+    def getColumnGames(self, name):
+        path = self.getColumnPath(name)
+        if not os.path.exists(path): return 0
+        rowSize = numpy.dtype(self.columnTypes[name]).itemsize * self.getWidth(name)
+        return os.path.getsize(path) // rowSize
+
+    #cuts every column back to the games all of them have (a write may have
+    #been interrupted part way through)
+    def repair(self):
+        games = min([self.getColumnGames(name) for name in self.columnTypes])
+        for name in self.columnTypes:
+            path = self.getColumnPath(name)
+            rowSize = numpy.dtype(self.columnTypes[name]).itemsize * self.getWidth(name)
+            if os.path.exists(path) and os.path.getsize(path) > games * rowSize:
+                with open(path, "r+b") as f: f.truncate(games * rowSize)
+        return games
+
+    #the first game's roster becomes the store's; every game must match it
+    def setRoster(self, playerStats):
+        players = [(teamName, name) for (teamName, name, stats) in playerStats]
+        if self.players == None:
+            teamNames = []
+            for (teamName, name) in players:
+                if teamName not in teamNames: teamNames.append(teamName)
+            (self.teamNames, self.players) = (tuple(teamNames), players)
+            meta = {"version": self.version, "columns": self.columnTypes,
+                    "teamNames": list(self.teamNames),
+                    "players": [list(player) for player in players]}
+            with open(self.getMetaPath(), "w") as f: json.dump(meta, f, indent=2)
+        elif players != self.players:
+            raise ValueError("game's roster doesn't match the store's")
+
+    #adds one game, as returned by batchRunner.simulateGame
+    def append(self, result):
+        (seed, scores, playerStats) = result
+        self.setRoster(playerStats)
+        buffers = self.buffers
+        buffers["seed"].append(seed)
+        buffers["teamOneScore"].append(scores[0])
+        buffers["teamTwoScore"].append(scores[1])
+        for stat in Stat.keys:
+            buffers[stat].extend([stats[stat] for (teamName, name, stats) in playerStats])
+        self.buffered += 1
+        if self.buffered >= self.bufferGames: self.flush()
+
+    #writes the buffered games to the end of every column
+    def flush(self):
+        if self.buffered == 0: return
+        for (name, values) in self.buffers.items():
+            with open(self.getColumnPath(name), "ab") as f:
+                numpy.asarray(values, dtype=self.columnTypes[name]).tofile(f)
+            del values[:]
+        self.games += self.buffered
+        self.buffered = 0
+
+    def close(self):
+        self.flush()
+
+    #a column, memory-mapped: one value per game, or for a stat, one row per
+    #game with a value per player
+    def column(self, name):
+        dtype = numpy.dtype(self.columnTypes[name])
+        shape = (self.games, self.getWidth(name)) if self.isPlayerColumn(name) else (self.games,)
+        #numpy can't map an empty file
+        if self.games == 0: return numpy.zeros(shape, dtype)
+        return numpy.memmap(self.getColumnPath(name), dtype, "r", shape=shape)
+
+    #every stat summed over all games, per player
+    def getTotals(self):
+        return dict([(stat, self.column(stat).sum(axis=0)) for stat in Stat.keys])
+
+    #made / attempted over all games, per player (nan for no attempts)
+    def getPercentages(self, made, attempted):
+        made = self.column(made).sum(axis=0).astype(float)
+        attempted = self.column(attempted).sum(axis=0)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            return made / attempted
+
+if __name__ == "__main__":
+    from tabulate import tabulate
+    store = ResultStore(sys.argv[1] if len(sys.argv) > 1 else "results")
+    print("%d games in %s" % (store.games, store.path))
+    if store.games > 0:
+        totals = store.getTotals()
+        fieldGoals = store.getPercentages("FGM", "FGA")
+        threes = store.getPercentages("3PM", "3PA")
+        rows = []
+        for (index, (teamName, name)) in enumerate(store.players):
+            rows.append([name, teamName, totals["PTS"][index] / float(store.games),
+                         100 * fieldGoals[index], 100 * threes[index]])
+        print(tabulate(rows, headers=["Name", "Team", "PTS/game", "FG%", "3P%"],
+                       floatfmt=".1f", coltypes=[str, str, float, float, float]))
@@ -0,0 +1,28 @@
+#Field goal percentage as a function of shot distance and defender distance
+#(http://analyticsgame.com/nba/stat-exploration-modeling-field-goal-percentage.html),
+#in one place, for taking shots and for sizing up shots that haven't been
+#taken: one at a time, or a whole array of them at once.
+#(A lookup table over both distances was tried; in Python, interpolating in
+#it is slower than just working the formula out, one shot or many.)
+import math
+import numpy
+
+class ShotModel(object):
+    #FGP of a shot from shotDistance ft. out with the defender defenderDistance
+    #ft. away (0 to 1, or below 0 from far enough out)
+    def fgp(self, shotDistance, defenderDistance):
+        return (67.6 - 1.05 * shotDistance)/(1 + math.e**(-(0.273 * defenderDistance + 0.349)))/100
+
+    #fgp for whole arrays of shots at once
+    def fgpArray(self, shotDistances, defenderDistances):
+        return ((67.6 - 1.05 * numpy.asarray(shotDistances)) /
+                (1 + numpy.exp(-(0.273 * numpy.asarray(defenderDistances) + 0.349))) / 100)
+
+    #points a shot is worth on average (a negative FGP counts as no chance)
+    def expectedShotValue(self, shotDistance, defenderDistance, isThree):
+        return max(self.fgp(shotDistance, defenderDistance), 0.0) * (3 if isThree else 2)
+
+    #expectedShotValue for whole arrays of shots at once
+    def expectedShotValues(self, shotDistances, defenderDistances, isThree):
+        points = numpy.where(isThree, 3.0, 2.0)
+        return numpy.maximum(self.fgpArray(shotDistances, defenderDistances), 0.0) * points
@@ -0,0 +1,76 @@
+#Uniform grid over the court (the same 10 x 5 split as GameEngine.setSpots)
+#for finding who is near a point or a line without checking every player.
+#Each player is filed under the cell he's standing in, and only moves to
+#another cell's list when he crosses into it.
+import math
+
+class SpatialGrid(object):
+    def __init__(self, left, top, width, height, cols=10, rows=5):
+        (self.left, self.top) = (left, top)
+        self.cols = cols
+        self.rows = rows
+        self.cellWidth = width / float(cols)
+        self.cellHeight = height / float(rows)
+        self.cells = [set() for cell in range(cols * rows)]
+        self.cellOf = {} #index -> the cell he's filed under
+        self.locations = {} #index -> (x, y)
+
+    #the cell a point falls in; points off the court go in the nearest edge cell
+    def cellAt(self, x, y):
+        col = int((x - self.left) // self.cellWidth)
+        row = int((y - self.top) // self.cellHeight)
+        if col < 0: col = 0
+        elif col >= self.cols: col = self.cols - 1
+        if row < 0: row = 0
+        elif row >= self.rows: row = self.rows - 1
+        return (col, row)
+
+    #files (or re-files) someone under the cell he's now in
+    def update(self, index, location):
+        (x, y) = location
+        self.locations[index] = (x, y)
+        (col, row) = self.cellAt(x, y)
+        cell = row * self.cols + col
+        oldCell = self.cellOf.get(index)
+        if oldCell == cell: return
+        if oldCell != None: self.cells[oldCell].discard(index)
+        self.cells[cell].add(index)
+        self.cellOf[index] = cell
+
+    #everyone filed in the cells that overlap a box
+    def candidates(self, x0, y0, x1, y1):
+        (col0, row0) = self.cellAt(x0, y0)
+        (col1, row1) = self.cellAt(x1, y1)
+        if col0 == col1 and row0 == row1:
+            return self.cells[row0 * self.cols + col0]
+        found = []
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                found.extend(self.cells[row * self.cols + col])
+        return found
+
+    #everyone closer than r to a point, by index
+    def near(self, point, r):
+        (x, y) = point
+        locations = self.locations
+        found = [index for index in self.candidates(x - r, y - r, x + r, y + r)
+                 if math.hypot(locations[index][0] - x, locations[index][1] - y) < r]
+        if len(found) > 1: found.sort()
+        return found
+
+    #everyone closer than r to the line segment from p0 to p1, by index
+    def nearSegment(self, p0, p1, r):
+        (x0, y0) = p0
+        (x1, y1) = p1
+        (dx, dy) = (x1 - x0, y1 - y0)
+        lengthSquared = dx**2 + dy**2
+        found = []
+        for index in self.candidates(min(x0, x1) - r, min(y0, y1) - r,
+                                     max(x0, x1) + r, max(y0, y1) + r):
+            (px, py) = self.locations[index]
+            #closest point on the segment, as a fraction of the way along it
+            if lengthSquared == 0: t = 0
+            else: t = min(max(((px-x0)*dx + (py-y0)*dy) / lengthSquared, 0), 1)
+            if math.hypot(px - (x0 + t*dx), py - (y0 + t*dy)) < r:
+                found.append(index)
+        return sorted(found)
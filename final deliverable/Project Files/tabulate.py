@@ -5,6 +5,7 @@
 from __future__ import print_function
 from __future__ import unicode_literals
 from collections import namedtuple
+from itertools import islice
 from platform import python_version_tuple
 import re
 
@@ -27,7 +28,8 @@ else:
     _binary_type = bytes
 
 
-__all__ = ["tabulate", "tabulate_formats", "simple_separated_format"]
+__all__ = ["tabulate", "tabulate_iter", "tabulate_formats",
+           "simple_separated_format"]
 __version__ = "0.7.3"
 
 
@@ -326,6 +328,24 @@ def _afterpoint(string):
         return -1  # not a number
 
 
+# a number written out plainly, e.g. "-12", "3.", ".5" or "1.5e+05"
+_plain_number = re.compile(r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$")
+
+
+def _afterpoint_fast(string):
+    """Same as _afterpoint, but without trying to parse plain numbers.
+
+    >>> [_afterpoint_fast(s) for s in ["123.45", "1001", "eggs", "123e45", "inf"]]
+    [2, -1, -1, 2, -1]
+
+    """
+    if not _plain_number.match(string):
+        return _afterpoint(string)
+    pos = string.rfind(".")
+    pos = string.lower().rfind("e") if pos < 0 else pos
+    return len(string) - pos - 1 if pos >= 0 else -1
+
+
 def _padleft(width, s, has_invisible=True):
     """Flush right.
 
@@ -383,9 +403,13 @@ def _visible_width(s):
         return len(_text_type(s))
 
 
-def _align_column(strings, alignment, minwidth=0, has_invisible=True):
+def _align_column(strings, alignment, minwidth=0, has_invisible=True,
+                  decimals=None):
     """[string] -> [padded_string]
 
+    `decimals` are the symbols after each string's decimal point, if
+    they are already known; they are only used for "decimal" alignment.
+
     >>> list(map(str,_align_column(["12.345", "-1234.5", "1.23", "1234.5", "1e+234", "1.0e234"], "decimal")))
     ['   12.345  ', '-1234.5    ', '    1.23   ', ' 1234.5    ', '    1e+234 ', '    1.0e234']
 
@@ -400,7 +424,8 @@ def _align_column(strings, alignment, minwidth=0, has_invisible=True):
         strings = [s.strip() for s in strings]
         padfn = _padboth
     elif alignment == "decimal":
-        decimals = [_afterpoint(s) for s in strings]
+        if decimals is None:
+            decimals = [_afterpoint(s) for s in strings]
         maxdecimals = max(decimals)
         strings = [s + (maxdecimals - decs) * " "
                    for s, decs in zip(strings, decimals)]
@@ -417,7 +442,17 @@ def _align_column(strings, alignment, minwidth=0, has_invisible=True):
         width_fn = len
 
     maxwidth = max(max(map(width_fn, strings)), minwidth)
-    padded_strings = [padfn(maxwidth, s, has_invisible) for s in strings]
+    if has_invisible:
+        padded_strings = [padfn(maxwidth, s, has_invisible) for s in strings]
+    else:
+        # every string gets the same width, so pad them all in one go
+        if padfn is _padleft:
+            padded_strings = [s.rjust(maxwidth) for s in strings]
+        elif padfn is _padright:
+            padded_strings = [s.ljust(maxwidth) for s in strings]
+        else:
+            fmt = ("{0:^%ds}" % maxwidth).format
+            padded_strings = [fmt(s) for s in strings]
     return padded_strings
 
 
@@ -480,6 +515,50 @@ def _format(val, valtype, floatfmt, missingval=""):
         return "{0}".format(val)
 
 
+def _format_column(values, valtype, floatfmt, missingval=""):
+    """Format a whole column of values already known to be of `valtype`.
+
+    >>> _format_column([1, None, 3.5], float, ".1f", "?")
+    ['1.0', '?', '3.5']
+
+    """
+    if valtype is float:
+        return [missingval if v is None else format(float(v), floatfmt)
+                for v in values]
+    elif valtype is _binary_type:
+        return [_format(v, valtype, floatfmt, missingval) for v in values]
+    elif valtype is int:
+        return [missingval if v is None else _text_type(v) for v in values]
+    else:
+        fmt = "{0}".format
+        return [missingval if v is None else fmt(v) for v in values]
+
+
+def _declared_types(coltypes, disable_numparse, ncols):
+    """A column type per column, or None where it has to be inferred.
+
+    >>> _declared_types([int, str], False, 3) == [int, _text_type, None]
+    True
+    >>> _declared_types(None, True, 2) == [_text_type, _text_type]
+    True
+
+    """
+    default = _text_type if disable_numparse else None
+    declared = list(coltypes or [])[:ncols]
+    declared += [default] * (ncols - len(declared))
+    types = []
+    for ct in declared:
+        if ct is None:
+            types.append(default)
+        elif ct is str or ct is _text_type:
+            types.append(_text_type)
+        elif ct in [int, float, _binary_type]:
+            types.append(ct)
+        else:
+            raise ValueError("unsupported column type: %r" % (ct,))
+    return types
+
+
 def _align_header(header, alignment, width):
     if alignment == "left":
         return _padright(width, header)
@@ -604,7 +683,7 @@ def _normalize_tabular_data(tabular_data, headers):
 
 def tabulate(tabular_data, headers=[], tablefmt="simple",
              floatfmt="g", numalign="decimal", stralign="left",
-             missingval=""):
+             missingval="", coltypes=None, disable_numparse=False):
     """Format a fixed width table for pretty printing.
 
     >>> print(tabulate([[1, 2.34], [-56, "8.999"], ["2", "10001"]]))
@@ -661,6 +740,28 @@ def tabulate(tabular_data, headers=[], tablefmt="simple",
     `floatfmt` is a format specification used for columns which
     contain numeric data with a decimal point.
 
+    Known column types
+    ------------------
+
+    Type detection parses every cell, which is slow for big tables.
+    If the column types are known in advance, pass them as `coltypes`
+    (int, float or str per column; None to detect that column's type).
+    Values in those columns are taken to be of the declared type
+    without being checked. `disable_numparse=True` treats every column
+    without a declared type as text, so nothing is parsed at all:
+
+    >>> print(tabulate([["spam", 41.9999], ["eggs", 451]], coltypes=[str, float]))
+    ----  --------
+    spam   41.9999
+    eggs  451
+    ----  --------
+
+    >>> print(tabulate([["spam", "41.9999"], ["eggs", "451.0"]], disable_numparse=True))
+    ----  -------
+    spam  41.9999
+    eggs  451.0
+    ----  -------
+
     `None` values are replaced with a `missingval` string:
 
     >>> print(tabulate([["spam", 1, None],
@@ -815,10 +916,15 @@ def tabulate(tabular_data, headers=[], tablefmt="simple",
         tabular_data = []
     list_of_lists, headers = _normalize_tabular_data(tabular_data, headers)
 
+    cols = list(zip(*list_of_lists))
+    declared = _declared_types(coltypes, disable_numparse, len(cols))
+
     # optimization: look for ANSI control codes once,
-    # enable smart width functions only if a control code is found
+    # enable smart width functions only if a control code is found;
+    # columns declared numeric can't hold any, so they are not searched
+    searched = [c for c, ct in zip(cols, declared) if ct not in [int, float]]
     plain_text = '\n'.join(['\t'.join(map(_text_type, headers))] + \
-                            ['\t'.join(map(_text_type, row)) for row in list_of_lists])
+                            ['\t'.join(map(_text_type, c)) for c in searched])
     has_invisible = re.search(_invisible_codes, plain_text)
     if has_invisible:
         width_fn = _visible_width
@@ -826,16 +932,26 @@ def tabulate(tabular_data, headers=[], tablefmt="simple",
         width_fn = len
 
     # format rows and columns, convert numeric values to strings
-    cols = list(zip(*list_of_lists))
-    coltypes = list(map(_column_type, cols))
-    cols = [[_format(v, ct, floatfmt, missingval) for v in c]
-             for c,ct in zip(cols, coltypes)]
+    coltypes = [ct if ct is not None else _column_type(c)
+                for c, ct in zip(cols, declared)]
+    cols = [_format_column(c, ct, floatfmt, missingval) if known is not None
+            else [_format(v, ct, floatfmt, missingval) for v in c]
+            for c, ct, known in zip(cols, coltypes, declared)]
+
+    # decimal points of declared numeric columns, found without parsing
+    decimals = [None] * len(cols)
+    if numalign == "decimal":
+        for i, (c, known) in enumerate(zip(cols, declared)):
+            if known is int:
+                decimals[i] = [-1] * len(c)
+            elif known is float:
+                decimals[i] = [_afterpoint_fast(s) for s in c]
 
     # align columns
     aligns = [numalign if ct in [int,float] else stralign for ct in coltypes]
     minwidths = [width_fn(h) + MIN_PADDING for h in headers] if headers else [0]*len(cols)
-    cols = [_align_column(c, a, minw, has_invisible)
-            for c, a, minw in zip(cols, aligns, minwidths)]
+    cols = [_align_column(c, a, minw, has_invisible, decs)
+            for c, a, minw, decs in zip(cols, aligns, minwidths, decimals)]
 
     if headers:
         # align headers and add headers
@@ -894,35 +1010,166 @@ def _pad_row(cells, padding):
 
 def _format_table(fmt, headers, rows, colwidths, colaligns):
     """Produce a plain-text representation of the table."""
-    lines = []
+    return "\n".join(_iter_table(fmt, headers, rows, colwidths, colaligns))
+
+
+def _iter_table(fmt, headers, rows, colwidths, colaligns):
+    """Produce the lines of a plain-text table one at a time.
+
+    `rows` can be any iterable of aligned rows; only one is held at a time.
+
+    """
     hidden = fmt.with_header_hide if (headers and fmt.with_header_hide) else []
     pad = fmt.padding
     headerrow = fmt.headerrow
 
     padded_widths = [(w + 2*pad) for w in colwidths]
     padded_headers = _pad_row(headers, pad)
-    padded_rows = [_pad_row(row, pad) for row in rows]
+    padded_rows = (_pad_row(row, pad) for row in rows)
 
     if fmt.lineabove and "lineabove" not in hidden:
-        lines.append(_build_line(padded_widths, colaligns, fmt.lineabove))
+        yield _build_line(padded_widths, colaligns, fmt.lineabove)
 
     if padded_headers:
-        lines.append(_build_row(padded_headers, padded_widths, colaligns, headerrow))
+        yield _build_row(padded_headers, padded_widths, colaligns, headerrow)
         if fmt.linebelowheader and "linebelowheader" not in hidden:
-            lines.append(_build_line(padded_widths, colaligns, fmt.linebelowheader))
-
-    if padded_rows and fmt.linebetweenrows and "linebetweenrows" not in hidden:
-        # initial rows with a line below
-        for row in padded_rows[:-1]:
-            lines.append(_build_row(row, padded_widths, colaligns, fmt.datarow))
-            lines.append(_build_line(padded_widths, colaligns, fmt.linebetweenrows))
-        # the last row without a line below
-        lines.append(_build_row(padded_rows[-1], padded_widths, colaligns, fmt.datarow))
+            yield _build_line(padded_widths, colaligns, fmt.linebelowheader)
+
+    if fmt.linebetweenrows and "linebetweenrows" not in hidden:
+        # a line below every row but the last
+        between = _build_line(padded_widths, colaligns, fmt.linebetweenrows)
+        for i, row in enumerate(padded_rows):
+            if i > 0:
+                yield between
+            yield _build_row(row, padded_widths, colaligns, fmt.datarow)
     else:
         for row in padded_rows:
-            lines.append(_build_row(row, padded_widths, colaligns, fmt.datarow))
+            yield _build_row(row, padded_widths, colaligns, fmt.datarow)
 
     if fmt.linebelow and "linebelow" not in hidden:
-        lines.append(_build_line(padded_widths, colaligns, fmt.linebelow))
+        yield _build_line(padded_widths, colaligns, fmt.linebelow)
+
+
+def _align_cell(string, alignment, width, maxdecimals=0, has_invisible=True):
+    """Pad one cell the way `_align_column` pads a whole column.
+
+    >>> _align_cell("1.5", "decimal", 7, 2, False)
+    '   1.5 '
+
+    """
+    if alignment == "decimal":
+        string = string + (maxdecimals - _afterpoint_fast(string)) * " "
+        return _padleft(width, string, has_invisible)
+    elif not alignment:
+        return string
+    elif alignment == "right":
+        return _padleft(width, string.strip(), has_invisible)
+    elif alignment == "center":
+        return _padboth(width, string.strip(), has_invisible)
+    else:
+        return _padright(width, string.strip(), has_invisible)
+
+
+def _format_cell(val, valtype, floatfmt, missingval=""):
+    "Like _format, but falls back to text for values that don't fit the type."
+    try:
+        return _format(val, valtype, floatfmt, missingval)
+    except (ValueError, TypeError):
+        return "{0}".format(val)
+
+
+def tabulate_iter(rows, headers=[], tablefmt="simple",
+                  floatfmt="g", numalign="decimal", stralign="left",
+                  missingval="", coltypes=None, disable_numparse=False,
+                  colwidths=None, sample=1000):
+    """Format a fixed width table like `tabulate`, but one line at a time.
+
+    `rows` can be any iterable of row sequences, e.g. a generator, and
+    is consumed lazily, so tables of any length take constant memory.
+    `headers` is a list of column headers, or "firstrow".
+
+    Column types and widths are worked out from the first `sample` rows
+    only (every other argument means the same as for `tabulate`). If all
+    rows fit in the sample, the lines are exactly those of `tabulate`:
+
+    >>> "\\n".join(tabulate_iter(iter([["spam", 41.9999], ["eggs", 451]]),
+    ...     ["strings", "numbers"])) == tabulate([["spam", 41.9999], ["eggs", 451]],
+    ...     ["strings", "numbers"])
+    True
+
+    Later cells wider than their column are not cut; they just push the
+    rest of their row to the right. Widths can be given up front as
+    `colwidths` instead (a header is never made narrower than itself):
+
+    >>> for line in tabulate_iter(([i, i*i] for i in (1, 10, 100)),
+    ...                           colwidths=[3, 5], sample=0, coltypes=[int, int]):
+    ...     print(line)
+    ---  -----
+      1      1
+     10    100
+    100  10000
+    ---  -----
+
+    Rows shorter than the header are padded with `missingval`.
+
+    """
+    rows = iter(rows)
+    if headers == "firstrow":
+        headers = next(rows, [])
+    headers = list(map(_text_type, headers))
+
+    # the first `sample` rows decide the column types and widths
+    sampled = [list(row) for row in islice(rows, sample)]
+    ncols = max([len(headers), len(colwidths or []), len(coltypes or [])] +
+                [len(row) for row in sampled])
+    sampled = [row + [None] * (ncols - len(row)) for row in sampled]
+    if headers:
+        headers = [""] * (ncols - len(headers)) + headers
+    cols = list(zip(*sampled)) or [()] * ncols
+    declared = _declared_types(coltypes, disable_numparse, ncols)
+
+    plain_text = '\n'.join(['\t'.join(headers)] + \
+                            ['\t'.join(map(_text_type, row)) for row in sampled])
+    has_invisible = re.search(_invisible_codes, plain_text)
+    width_fn = _visible_width if has_invisible else len
+
+    coltypes = [ct if ct is not None else (_column_type(c) if c else _text_type)
+                for c, ct in zip(cols, declared)]
+    aligns = [numalign if ct in [int,float] else stralign for ct in coltypes]
+    cols = [[_format_cell(v, ct, floatfmt, missingval) for v in c]
+            for c, ct in zip(cols, coltypes)]
+    maxdecimals = [max([_afterpoint_fast(s) for s in c] or [-1]) if a == "decimal" else 0
+                   for c, a in zip(cols, aligns)]
+
+    if colwidths is not None:
+        widths = list(colwidths) + [0] * (ncols - len(colwidths))
+        if headers:
+            widths = [max(w, width_fn(h)) for w, h in zip(widths, headers)]
+    else:
+        minwidths = [width_fn(h) + MIN_PADDING for h in headers] if headers else [0]*ncols
+        widths = []
+        for c, a, minw, decs in zip(cols, aligns, minwidths, maxdecimals):
+            # the width `tabulate` would give the sampled column
+            c = _align_column(c, a, minw, has_invisible) if c else ['']
+            widths.append(max(minw, width_fn(c[0])) if headers else width_fn(c[0]))
+    if headers:
+        headers = [_align_header(h, a, w) for h, a, w in zip(headers, aligns, widths)]
+
+    def aligned_rows():
+        for row in sampled:
+            yield [_align_cell(_format_cell(v, ct, floatfmt, missingval),
+                               a, w, decs, has_invisible)
+                   for v, ct, a, w, decs in zip(row, coltypes, aligns, widths, maxdecimals)]
+        del sampled[:]
+        for row in rows:
+            row = list(row)
+            row += [None] * (ncols - len(row))
+            yield [_align_cell(_format_cell(v, ct, floatfmt, missingval),
+                               a, w, decs, has_invisible)
+                   for v, ct, a, w, decs in zip(row, coltypes, aligns, widths, maxdecimals)]
+
+    if not isinstance(tablefmt, TableFormat):
+        tablefmt = _table_formats.get(tablefmt, _table_formats["simple"])
 
-    return "\n".join(lines)
+    for line in _iter_table(tablefmt, headers, aligned_rows(), widths, aligns):
+        yield line